@@ -50,6 +50,14 @@ class Neo4jConnector:
         
         self.nodes: Dict[str, ThreatNode] = {}
         self.relationships: List[ThreatRelationship] = []
+        # Bumped on every graph write so readers can tell when cached views are
+        # stale. Only the in-memory simulation store is versioned; writes to a
+        # live Neo4j server leave it unchanged.
+        self.write_version = 0
+        # Identity of the persistence file as loaded, and the write_version
+        # at which the in-memory graph last matched it
+        self._snapshot: Optional[tuple] = None
+        self._saved_version = 0
         
         # Set persistence file path
         self.persistence_file = persistence_file or self.PERSISTENCE_FILE
@@ -87,8 +95,8 @@ class Neo4jConnector:
             self.connected = False
             logger.info("Neo4j connection closed")
         
-        # Save persistent data if in simulation mode
-        if self.simulation_mode:
+        # Save persistent data if in simulation mode and anything changed
+        if self.simulation_mode and self.write_version != self._saved_version:
             self._save_persistent_data()
     
     def _save_persistent_data(self) -> None:
@@ -125,6 +133,8 @@ class Neo4jConnector:
             
             # Atomic rename
             temp_file.replace(self.persistence_file)
+            self._saved_version = self.write_version
+            self._snapshot = None  # The file no longer identifies a load
             logger.debug(f"Saved {len(self.nodes)} nodes and {len(self.relationships)} relationships to {self.persistence_file}")
         except Exception as e:
             logger.error(f"Failed to save persistent data: {e}")
@@ -133,10 +143,14 @@ class Neo4jConnector:
         """Load nodes and relationships from JSON file."""
         if not self.persistence_file.exists():
             logger.debug(f"Persistence file not found at {self.persistence_file}, starting with empty database")
+            self._snapshot = (str(self.persistence_file), None, None)
             return
         
         try:
             with open(self.persistence_file, 'r', encoding='utf-8') as f:
+                # Stat the open file: saves replace it atomically, so this
+                # identifies exactly the contents being read
+                stat = os.fstat(f.fileno())
                 data = json.load(f)
             
             # Load nodes
@@ -158,10 +172,27 @@ class Neo4jConnector:
                 )
                 self.relationships.append(rel)
             
+            self.write_version += 1
+            self._saved_version = self.write_version
+            self._snapshot = (str(self.persistence_file), stat.st_mtime_ns, stat.st_size)
             logger.info(f"Loaded {len(self.nodes)} nodes and {len(self.relationships)} relationships from {self.persistence_file}")
         except Exception as e:
             logger.error(f"Failed to load persistent data: {e}")
             
+    def snapshot_key(self) -> Optional[tuple]:
+        """
+        Identify the stored graph this connector holds, for caches shared
+        across connector instances.
+        
+        Returns:
+            A key equal for every connector loaded from the same persistence
+            file contents, or None when there are unsaved writes or the
+            connector is backed by a live Neo4j server
+        """
+        if not self.simulation_mode or self.write_version != self._saved_version:
+            return None
+        return self._snapshot
+    
     def create_node(self, node: ThreatNode) -> bool:
         """
         Create a node in the graph.
@@ -174,6 +205,7 @@ class Neo4jConnector:
         """
         if self.simulation_mode:
             self.nodes[node.node_id] = node
+            self.write_version += 1
             logger.debug(f"Created node (sim): {node.node_id}")
             return True
             
@@ -203,6 +235,7 @@ class Neo4jConnector:
         """
         if self.simulation_mode:
             self.relationships.append(rel)
+            self.write_version += 1
             logger.debug(f"Created relationship (sim): {rel.source_id} -> {rel.target_id}")
             return True
             
@@ -260,6 +293,66 @@ class Neo4jConnector:
             logger.error(f"Failed to get node: {e}")
             return None
             
+    def ensure_cve_search_index(self) -> bool:
+        """
+        Create the full-text index over CVE names and descriptions if missing.
+        
+        Returns:
+            True if the index exists (always False in simulation mode)
+        """
+        if self.simulation_mode:
+            return False
+            
+        try:
+            with self.driver.session() as session:
+                session.run(
+                    "CREATE FULLTEXT INDEX cveSearch IF NOT EXISTS "
+                    "FOR (c:CVE) ON EACH [c.name, c.description]"
+                )
+                return True
+        except Exception as e:
+            logger.error(f"Failed to create CVE search index: {e}")
+            return False
+            
+    def search_cves(self, terms: List[str], 
+                    severities: Optional[List[str]] = None) -> List[ThreatNode]:
+        """
+        Find CVE nodes whose name or description mentions any of the terms.
+        
+        Args:
+            terms: Search terms, each matched as a phrase
+            severities: Allowed severity values, or None for any
+            
+        Returns:
+            List of candidate CVE nodes (empty in simulation mode)
+        """
+        if self.simulation_mode or not terms:
+            return []
+            
+        # Quote each term as a Lucene phrase so dots, dashes etc. need no escaping
+        search = ' OR '.join(
+            '"' + term.replace('\\', '\\\\').replace('"', '\\"') + '"' for term in terms
+        )
+        try:
+            with self.driver.session() as session:
+                query = """
+                CALL db.index.fulltext.queryNodes('cveSearch', $search) YIELD node
+                WHERE $severities IS NULL
+                   OR toLower(coalesce(node.severity, 'medium')) IN $severities
+                RETURN node
+                """
+                result = session.run(query, search=search, severities=severities)
+                
+                nodes = []
+                for record in result:
+                    properties = dict(record['node'])
+                    node_id = properties.pop('node_id')
+                    nodes.append(ThreatNode(node_id=node_id, node_type='CVE', properties=properties))
+                return nodes
+        except Exception as e:
+            logger.error(f"Failed to search CVEs: {e}")
+            return []
+            
     def find_related_nodes(self, node_id: str, 
                           relationship_type: Optional[str] = None,
                           max_depth: int = 1) -> List[ThreatNode]:
@@ -430,6 +523,7 @@ class Neo4jConnector:
         if self.simulation_mode:
             self.nodes.clear()
             self.relationships.clear()
+            self.write_version += 1
             # Clear persistence file too
             if self.persistence_file.exists():
                 self.persistence_file.unlink()
@@ -1,4 +1,4 @@
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Optional, Dict
@@ -6,6 +6,7 @@ import sys
 import os
 import logging
 import datetime as dt
+import itertools
 import requests
 
 # ensure project root is on path
@@ -25,6 +26,13 @@ logger = logging.getLogger("uvicorn")
 # Import Redis cache
 from services.redis_cache import cache, cache_response, invalidate_cache_on_update
 
+# orjson lets large payloads skip FastAPI's pure-Python jsonable_encoder pass
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 app = FastAPI(title="AI Cyber Threat Forecaster API")
 
 # Startup and shutdown events for Redis
@@ -36,8 +44,14 @@ async def startup_event():
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    """Close Redis connection on shutdown."""
+    """Close Redis connection, pooled crawler sessions and CVE matching workers on shutdown."""
     await cache.disconnect()
+    crawler = sys.modules.get("scripts.crawler_orchestrator")
+    if crawler is not None:
+        crawler.close_session()
+    cve_matcher = sys.modules.get("scripts.cve_matcher")
+    if cve_matcher is not None:
+        cve_matcher.close_match_pool()
     logger.info("Application shutdown complete")
 
 # Allow local frontend during development
@@ -217,7 +231,7 @@ async def start_crawler(request: Request):
     
     # Try to import a crawler orchestration if present, else simulate
     try:
-        from scripts.crawler_orchestrator import run_crawler
+        from scripts.crawler_orchestrator import run_crawler, forget_records
         from data_layer.neo4j_connector import store_crawler_records
 
         result = run_crawler(start_date=start_date, end_date=end_date)
@@ -371,7 +385,8 @@ async def start_crawler(request: Request):
                         "stats:*",
                         "threats:*", 
                         "charts:*",
-                        "get_threat:*"
+                        "get_threat:*",
+                        "cve_matches:*"
                     ])
                     logger.info("Cache invalidated after crawler data update")
                     
@@ -386,6 +401,8 @@ async def start_crawler(request: Request):
                     result["stats"]["items_unique"] = total_unique
                 except Exception as e:
                     logger.warning(f"Failed to store crawler records: {e}")
+                    # Let the next run emit these records again
+                    forget_records(f"{r.get('source', 'unknown')}:{r.get('id', 'unknown')}" for r in records)
                     result["logs"].append({
                         "id": f"log-storage-error-{dt.datetime.utcnow().timestamp()}",
                         "timestamp": dt.datetime.utcnow().isoformat() + "Z",
@@ -401,6 +418,12 @@ async def start_crawler(request: Request):
                 "type": "success"
             })
             
+            # Records can number in the thousands; serialise them in one C pass
+            if ORJSON_AVAILABLE:
+                return Response(
+                    orjson.dumps(result, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS),
+                    media_type="application/json"
+                )
             return result
         return {"logs": result}
     except Exception as e:
@@ -485,6 +508,10 @@ async def delete_all_threats():
         connector.close()
         
         if success:
+            await invalidate_cache_on_update(["cve_matches:*"])
+            # Crawled records must be re-emitted now that they are gone
+            from scripts.crawler_orchestrator import forget_records
+            forget_records()
             logger.warning(f"Deleted all {total_before} threats from database")
             return {
                 "status": "success",
@@ -1600,13 +1627,26 @@ async def check_website(request: WebsiteCheckRequest):
                             'kickass', 'extratorrent', 'limetorrents', 'torlock']
         is_potential_piracy = any(indicator in url_lower for indicator in piracy_indicators)
         
-        # Step 2: Match against CVE database
+        # Step 2: Match against CVE database, cached per technology set and
+        # graph version; crawls and delete-all also clear cve_matches:* outright
         matcher = CVEMatcher()
-        matching_cves = matcher.find_matching_cves(technologies, min_severity=min_severity)
+        tech_key = cache.generate_cache_key(
+            sorted(matcher._extract_tech_names(technologies)),
+            matcher.connector.snapshot_key(),
+            matcher.connector.write_version,
+        )
+        matches_cache_key = f"cve_matches:{min_severity}:{tech_key}"
+        matching_cves = await cache.get(matches_cache_key)
+        if matching_cves is None:
+            matching_cves = matcher.find_matching_cves(technologies, min_severity=min_severity)
+            await cache.set(matches_cache_key, matching_cves, ttl=3600)
+        # The AI step below appends warnings and annotates entries in place;
+        # work on a per-request copy so the cached match list stays untouched
+        matching_cves = [dict(cve) for cve in matching_cves]
         
         # Get total CVE count in database for reporting
-        all_cves_in_db = matcher._get_all_cves()
-        total_cves_in_database = len(all_cves_in_db)
+        total_cves_in_database = matcher.count_cves()
+        sample_cves_in_db = list(itertools.islice(matcher._get_all_cves(), 100))
         
         logger.info(f"Found {len(matching_cves)} matching CVEs for {url} (out of {total_cves_in_database} total CVEs in database)")
         
@@ -1824,7 +1864,7 @@ Only mark as safe if site has HTTPS, proper security headers, and no matching vu
                 # Check if any CVE mentions this technology
                 tech_mentioned = any(
                     tech_name.lower() in (cve.get('description', '') + ' ' + cve.get('title', '')).lower()
-                    for cve in all_cves_in_db[:100]  # Check first 100 CVEs for performance
+                    for cve in sample_cves_in_db  # Check first 100 CVEs for performance
                 )
                 tech_check_status.append({
                     "name": tech_name,
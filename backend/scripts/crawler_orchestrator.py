@@ -2,13 +2,58 @@
 
 from __future__ import annotations
 
+import bisect
 import datetime as dt
+import gzip
+import hashlib
+import heapq
+import itertools
 import logging
 import os
-from dataclasses import dataclass, field
-from typing import Dict, Iterable, List, Optional
+import random
+import re
+import sqlite3
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from contextlib import closing
+from dataclasses import dataclass, field, fields
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    import json
+    ORJSON_AVAILABLE = False
+    _json_loads = json.loads
+
+    def _json_dumps(value: object) -> bytes:
+        return json.dumps(value, separators=(",", ":")).encode()
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+try:
+    import h2  # noqa: F401  (required by httpx for HTTP/2)
+    import httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 
 logger = logging.getLogger(__name__)
@@ -16,9 +61,74 @@ logger = logging.getLogger(__name__)
 
 DEFAULT_USER_AGENT = "CyberThreatCrawler/1.0 (https://vajra.local)"
 DEFAULT_TIMEOUT = 20
+CACHE_DIR = Path(os.environ.get("CRAWLER_CACHE_DIR", Path(__file__).parent.parent / "data" / "crawler_cache"))
+# Opt-in: set CRAWLER_SKIP_SEEN=1 to drop records already emitted unchanged by an earlier run.
+# Skipped records are reported separately as "items_skipped_seen".
+SKIP_SEEN_RECORDS = os.environ.get("CRAWLER_SKIP_SEEN", "0") == "1"
+SEEN_DB_PATH = CACHE_DIR / "seen_records.sqlite3"
+
+# Per-host concurrency caps; hosts without an entry share the "*" pool
+_HOST_LIMITS = {
+    "services.nvd.nist.gov": threading.BoundedSemaphore(10),
+    "api.github.com": threading.BoundedSemaphore(10),
+    "*": threading.BoundedSemaphore(16),
+}
+RETRY_STATUSES = {429, 503}
+MAX_RETRIES = 5
+MAX_SOURCE_WORKERS = 8  # Upper bound on crawler sources fetched at once
+NVD_DATE_WINDOWS = 4  # Publication-date windows queried concurrently per NVD crawl
+# Seconds between NVD requests: 50 per 30 s with an API key, 5 per 30 s without
+NVD_DELAY_WITH_KEY = 0.6
+NVD_DELAY_WITHOUT_KEY = 6.0
+NVD_PAGE_RETRIES = 3  # Extra attempts for an NVD page that failed after _request's own retries
+_DC_CREATOR = "{http://purl.org/dc/elements/1.1/}creator"
+
+# Keyword classifiers; the GitHub ones are matched against lowercased text
+_CVE_RE = re.compile(r"CVE-\d{4}-\d+")
+_HIGH_RE = re.compile(r"critical|0-day|zero-day|\brce\b|remote code execution|exploit|\bpoc\b|proof of concept|cve-", re.IGNORECASE)
+_GH_CRITICAL_RE = re.compile(r"critical|cvss:3\.1/av:n")
+_GH_LOW_RE = re.compile(r"\blow\b")
+
+
+def _build_session() -> requests.Session:
+    """Create the pooled session shared by every crawler."""
+    session = requests.Session()
+    session.headers["User-Agent"] = DEFAULT_USER_AGENT
+    # 429/503 are retried with longer backoff in _request; the adapter covers
+    # connection errors and gateway failures.
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 504], raise_on_status=False)
+    # One cached pool per crawled host (eight today), with headroom so none is evicted mid-run
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Keep-alive connections are reused across NVD pagination and across crawler runs
+_SESSION = _build_session()
+
+# With httpx[http2] installed, concurrent NVD page requests are multiplexed
+# over a single HTTP/2 connection instead of one HTTP/1.1 connection each.
+_NVD_HTTP2_CLIENT = (
+    httpx.Client(
+        http2=True,
+        timeout=DEFAULT_TIMEOUT,
+        headers={"User-Agent": DEFAULT_USER_AGENT},
+        transport=httpx.HTTPTransport(http2=True, retries=3),
+    )
+    if HTTP2_AVAILABLE
+    else None
+)
+
+
+def close_session() -> None:
+    """Release pooled crawler connections (called on application shutdown)."""
+    _SESSION.close()
+    if _NVD_HTTP2_CLIENT is not None:
+        _NVD_HTTP2_CLIENT.close()
 
 
-@dataclass
+@dataclass(slots=True)
 class CrawlerRecord:
     """Normalised representation of a crawled item."""
 
@@ -32,29 +142,193 @@ class CrawlerRecord:
     status: Optional[str] = None
     metadata: Dict[str, str] = field(default_factory=dict)
 ALLOWED_NVD_STATUSES = {"Analyzed", "Modified"}
+# CVSS metric keys in order of preference (newest scoring version first)
+_NVD_METRIC_KEYS = ("cvssMetricV40", "cvssMetricV31", "cvssMetricV30", "cvssMetricV3", "cvssMetricV2")
+# CVSS v3 qualitative ratings: bisect_right(thresholds, score) indexes the label
+_SEVERITY_THRESHOLDS = (4.0, 7.0, 9.0)
+_SEVERITY_LABELS = ("low", "medium", "high", "critical")
 
 
 
-@dataclass
+_LOG_COUNTER = itertools.count()
+
+
+def _next_log_id() -> str:
+    """Unique log id: wall-clock nanoseconds plus a process-wide sequence number."""
+    return f"log-{time.time_ns()}-{next(_LOG_COUNTER)}"
+
+
+@dataclass(slots=True)
 class CrawlerLog:
     """Log message returned to the frontend."""
 
     timestamp: str
     message: str
     type: str = "info"  # info | success | error | warning
-    id: str = field(default_factory=lambda: f"log-{dt.datetime.utcnow().timestamp()}-{id(dt.datetime.utcnow())}")
+    id: str = field(default_factory=_next_log_id)
+
+
+@lru_cache(maxsize=None)
+def _field_names(cls: type) -> Tuple[str, ...]:
+    return tuple(f.name for f in fields(cls))
+
+
+def _to_dict(obj: object) -> Dict[str, object]:
+    """Shallow dict of a slotted dataclass instance (slots=True has no ``__dict__``)."""
+    return {name: getattr(obj, name) for name in _field_names(type(obj))}
 
 
 def _log(message: str, level: str = "info") -> CrawlerLog:
-    now = dt.datetime.utcnow().isoformat() + "Z"
-    log_id = f"log-{dt.datetime.utcnow().timestamp()}-{id(now)}"
+    now = dt.datetime.now(dt.timezone.utc).isoformat().replace("+00:00", "Z")
     if level == "error":
         logger.error(message)
     elif level == "warning":
         logger.warning(message)
     else:
         logger.info(message)
-    return CrawlerLog(timestamp=now, message=message, type=level, id=log_id)
+    return CrawlerLog(timestamp=now, message=message, type=level)
+
+
+class NvdPacer:
+    """AIMD spacing between NVD requests.
+
+    The delay doubles on a throttling status (NVD answers over-rate clients
+    with 403; 429 is honoured too) and shrinks by ``step`` after every
+    successful response, clamped to ``[min_delay, max_delay]`` seconds.
+    """
+
+    THROTTLE_STATUSES = frozenset({403, 429})
+
+    def __init__(self, delay: float = 0.2, *, min_delay: float = 0.1, max_delay: float = 2.0, step: float = 0.01):
+        self.delay = delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.step = step
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_api_key(cls, api_key: Optional[str]) -> "NvdPacer":
+        """A pacer that starts at, and never drops below, NVD's published rate for the key tier."""
+        delay = NVD_DELAY_WITH_KEY if api_key else NVD_DELAY_WITHOUT_KEY
+        return cls(delay, min_delay=delay, max_delay=delay * 10, step=delay / 10)
+
+    def observe(self, status_code: int) -> None:
+        with self._lock:
+            if status_code in self.THROTTLE_STATUSES:
+                self.delay = min(self.max_delay, self.delay * 2)
+            elif status_code < 400:
+                self.delay = max(self.min_delay, self.delay - self.step)
+
+
+class DomainRateLimiter:
+    """Minimum spacing between request starts to the same host.
+
+    Slots are reserved under a lock and slept on outside it, so waiting on one
+    host never blocks requests to another.
+    """
+
+    def __init__(self, min_delay_ms: int):
+        self.min_delay = min_delay_ms / 1000
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host: str) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + self.min_delay
+        if slot > now:
+            time.sleep(slot - now)
+
+
+# Politeness floor per host; below the NvdPacer minimum so it never slows NVD further
+_DOMAIN_LIMITER = DomainRateLimiter(min_delay_ms=100)
+
+
+def _host_semaphore(url: str) -> threading.BoundedSemaphore:
+    """The concurrency slots reserved for the URL's host."""
+    return _HOST_LIMITS.get(urlsplit(url).hostname or "", _HOST_LIMITS["*"])
+
+
+def _release_on_close(response: requests.Response, semaphore: threading.BoundedSemaphore) -> None:
+    """Keep a host slot held until a streamed response is closed."""
+    close = response.close
+    released = False
+
+    def close_and_release() -> None:
+        nonlocal released
+        try:
+            close()
+        finally:
+            if not released:
+                released = True
+                semaphore.release()
+
+    response.close = close_and_release
+
+
+def _request(method: str, url: str, *, pacer: Optional[NvdPacer] = None, client=None, **kwargs) -> requests.Response:
+    """Issue an HTTP request under the host's concurrency cap.
+
+    Responses with a status in ``RETRY_STATUSES`` are retried up to
+    ``MAX_RETRIES`` times with jittered exponential backoff before
+    ``raise_for_status`` surfaces the error. Every status code is reported
+    to ``pacer`` when one is given. ``client`` defaults to the shared
+    requests session; an ``httpx.Client`` is also accepted.
+
+    With ``stream=True`` the host slot stays held while the body is read and
+    is released when the response is closed, so callers must close it
+    (``with response:``).
+    """
+    client = client or _SESSION
+    host = urlsplit(url).hostname or ""
+    semaphore = _host_semaphore(url)
+    stream = kwargs.get("stream", False)
+    for attempt in range(MAX_RETRIES + 1):
+        _DOMAIN_LIMITER.wait(host)
+        semaphore.acquire()
+        try:
+            response = client.request(method, url, **kwargs)
+        except BaseException:
+            semaphore.release()
+            raise
+        if stream:
+            _release_on_close(response, semaphore)
+        else:
+            semaphore.release()
+        if pacer is not None:
+            pacer.observe(response.status_code)
+        if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+            break
+        response.close()
+        delay = min(60, 2 ** attempt) + random.random()
+        logger.warning(f"{response.status_code} from {host}, retrying in {delay:.1f}s (attempt {attempt + 1}/{MAX_RETRIES})")
+        time.sleep(delay)
+    if not response.ok:
+        response.close()
+    response.raise_for_status()
+    return response
+
+
+def _content_hash(value: object) -> str:
+    """Return a short digest of a string or JSON-serialisable value that is stable across runs."""
+    if isinstance(value, str):
+        data = value.encode()
+    elif ORJSON_AVAILABLE:
+        data = orjson.dumps(value, option=orjson.OPT_SORT_KEYS)
+    else:
+        data = json.dumps(value, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def _request_headers(user_agent: str, api_key: Optional[str]) -> Dict[str, str]:
+    """Per-call headers on top of the session defaults."""
+    headers = {}
+    if user_agent != _SESSION.headers["User-Agent"]:
+        headers["User-Agent"] = user_agent
+    if api_key:
+        headers["apiKey"] = api_key
+    return headers
 
 
 def _fetch_json(
@@ -64,20 +338,158 @@ def _fetch_json(
     timeout: int = DEFAULT_TIMEOUT,
     params: Optional[Dict[str, str]] = None,
     api_key: Optional[str] = None,
+    pacer: Optional[NvdPacer] = None,
+    client=None,
 ) -> dict:
-    headers = {"User-Agent": user_agent}
-    if api_key:
-        headers["apiKey"] = api_key
-    response = requests.get(url, headers=headers, params=params, timeout=timeout)
-    response.raise_for_status()
-    return response.json()
+    headers = _request_headers(user_agent, api_key)
+    response = _request("GET", url, headers=headers, params=params, timeout=timeout, pacer=pacer, client=client)
+    return _json_loads(response.content)
+
+
+def _fetch_json_cached(url: str, name: str, *, user_agent: str, timeout: int = DEFAULT_TIMEOUT) -> object:
+    """Fetch JSON, revalidating a gzipped on-disk copy with ETag / Last-Modified.
+
+    A 304 response is served from ``CACHE_DIR/<name>.json.gz`` without
+    downloading or re-validating the body.
+    """
+    body_path = CACHE_DIR / f"{name}.json.gz"
+    validators_path = CACHE_DIR / f"{name}.etag.json"
+    headers = _request_headers(user_agent, None)
+    if body_path.exists():
+        try:
+            validators = _json_loads(validators_path.read_bytes())
+        except (OSError, ValueError):
+            validators = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+    response = _request("GET", url, headers=headers, timeout=timeout)
+    if response.status_code == 304:
+        logger.debug(f"{url} not modified, using cached copy")
+        return _json_loads(gzip.decompress(body_path.read_bytes()))
+
+    payload = _json_loads(response.content)
+    validators = {"etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified")}
+    if validators["etag"] or validators["last_modified"]:
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_path = body_path.with_suffix(".tmp")
+            tmp_path.write_bytes(gzip.compress(response.content, compresslevel=5))
+            tmp_path.replace(body_path)
+            validators_path.write_bytes(_json_dumps(validators))
+        except OSError as e:
+            logger.warning(f"Could not cache {url}: {e}")
+    return payload
+
+
+def _stream_json(
+    url: str,
+    *,
+    path: str,
+    user_agent: str,
+    timeout: int = DEFAULT_TIMEOUT,
+    params: Optional[Dict[str, str]] = None,
+    api_key: Optional[str] = None,
+    meta: Optional[Dict[str, object]] = None,
+    pacer: Optional[NvdPacer] = None,
+) -> Iterator[object]:
+    """Yield the items at ijson ``path`` of a JSON response as they are parsed.
+
+    Requires ``ijson``. Top-level scalar fields (e.g. ``totalResults``) are
+    copied into ``meta`` as they stream past.
+    """
+    headers = _request_headers(user_agent, api_key)
+    response = _request("GET", url, headers=headers, params=params, timeout=timeout, stream=True, pacer=pacer)
+    response.raw.decode_content = True
+    with response:
+        events = ijson.parse(response.raw, use_float=True)
+        if meta is not None:
+            events = _capture_top_level(events, meta)
+        yield from ijson.items(events, path)
+
+
+def _capture_top_level(events: Iterable[tuple], meta: Dict[str, object]) -> Iterator[tuple]:
+    for prefix, event, value in events:
+        if prefix and "." not in prefix and event in ("number", "string", "boolean", "null"):
+            meta[prefix] = value
+        yield prefix, event, value
+
+
+def _date_bounds(start_date: Optional[str], end_date: Optional[str]) -> Tuple[Optional[dt.date], Optional[dt.date]]:
+    """Parse optional YYYY-MM-DD filter bounds once; an invalid bound disables the filter."""
+    try:
+        start = dt.date.fromisoformat(start_date) if start_date else None
+        end = dt.date.fromisoformat(end_date) if end_date else None
+    except ValueError as e:
+        logger.debug(f"Ignoring invalid date filter: {e}")
+        return None, None
+    return start, end
+
+
+def _split_date_range(start: dt.datetime, end: dt.datetime, parts: int) -> List[Tuple[dt.datetime, dt.datetime]]:
+    """Split ``[start, end]`` into contiguous, non-overlapping windows, newest first."""
+    if end <= start or parts <= 1:
+        return [(start, end)]
+    step = (end - start) / parts
+    bounds = [start + step * i for i in range(parts)] + [end]
+    # NVD dates have one-second resolution, so offset each lower bound to avoid overlap
+    windows = [(bounds[i] + dt.timedelta(seconds=1 if i else 0), bounds[i + 1]) for i in range(parts)]
+    return windows[::-1]
+
+
+def _nvd_to_record(item: dict) -> Optional[CrawlerRecord]:
+    """Convert an NVD 2.0 vulnerability item into a record (None if it has no CVE id)."""
+    cve = item.get("cve", {})
+    status = cve.get("vulnStatus")
+    cve_id = cve.get("id")
+    if not cve_id:
+        return None
+
+    descriptions = cve.get("descriptions", [])
+    metrics = cve.get("metrics", {})
+
+    severity = None
+    score = None
+
+    # Use the newest CVSS version present; NVD lists one metric per source, primary first
+    metric_list = next((metrics[key] for key in _NVD_METRIC_KEYS if metrics.get(key)), None)
+    if metric_list:
+        metric = metric_list[0]
+        data = metric.get("cvssData", {})
+        severity = metric.get("baseSeverity") or data.get("baseSeverity")
+        score = data.get("baseScore")
+
+    # If severity is missing but we have a CVSS score, determine severity from score
+    if not severity and score is not None:
+        try:
+            severity = _SEVERITY_LABELS[bisect.bisect_right(_SEVERITY_THRESHOLDS, float(score))]
+        except (ValueError, TypeError):
+            pass
+
+    # Normalize severity to lowercase for consistency
+    if severity:
+        severity = severity.lower()
+
+    return CrawlerRecord(
+        id=cve_id,
+        source="nvd",
+        title=cve_id,
+        url=f"https://www.cve.org/CVERecord?id={cve_id}",
+        summary=descriptions[0].get("value", "") if descriptions else "",
+        published=cve.get("published"),
+        severity=severity,
+        status=status,
+        metadata={"cvss_score": str(score) if score is not None else ""},
+    )
 
 
 def crawl_nvd_recent(limit: int = 20, *, user_agent: str, start_date: str = None, end_date: str = None) -> Iterable[CrawlerRecord]:
     """Fetch recent CVEs from the NVD API.
     
     Args:
-        limit: Maximum number of CVEs to fetch
+        limit: Base number of CVEs to fetch; scaled up 2x-10x with the length of the date range
         user_agent: User agent string for requests
         start_date: Start date in YYYY-MM-DD format (optional)
         end_date: End date in YYYY-MM-DD format (optional)
@@ -104,16 +516,17 @@ def crawl_nvd_recent(limit: int = 20, *, user_agent: str, start_date: str = None
     
     api_key = os.environ.get("NVD_API_KEY")
     
-    # Fetch with pagination to get all results
-    all_vulnerabilities = []
-    start_index = 0
+    # Split the range into windows that are requested concurrently (newest first)
+    # and paginated independently; records are filtered and yielded as pages arrive.
+    windows = _split_date_range(start, end, NVD_DATE_WINDOWS)
     results_per_page = 2000  # NVD API max per page
-    # Remove max_pages limit - fetch ALL pages until we get all results
     pages_fetched = 0
-    total_results = None  # Will be set from first API response
-    
-    # Calculate expected range - increase limit for longer date ranges
+    seen = 0  # CVEs received from the API, regardless of status
+    emitted = 0  # Analyzed/Modified CVEs yielded so far
+    status_counts: Dict[str, int] = {}  # Skipped statuses, for diagnostics when nothing is emitted
     days_diff = (end - start).days
+    # Emit more than `limit` for longer date ranges so historical crawls
+    # still cover the whole range
     if days_diff > 1095:  # 3+ years
         target_limit = limit * 10  # Fetch many more for very long ranges
     elif days_diff > 730:  # 2+ years
@@ -124,164 +537,151 @@ def crawl_nvd_recent(limit: int = 20, *, user_agent: str, start_date: str = None
         target_limit = limit * 3
     else:
         target_limit = limit * 2
-    
-    # Fetch ALL pages until we get all results or hit the target limit
-    while True:
+    pacer = NvdPacer.for_api_key(api_key)
+    next_submit = time.monotonic() - pacer.delay
+
+    def fetch_page(window: Tuple[dt.datetime, dt.datetime], index: int, not_before: float) -> Tuple[int, int, List[dict], Dict[str, int]]:
+        """Return (totalResults, page size, Analyzed/Modified items, skipped status counts)."""
+        # Pacing is applied in the worker so it overlaps with record building
+        delay = not_before - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
         params = {
             "resultsPerPage": str(results_per_page),
-            "startIndex": str(start_index),
-            "pubStartDate": start.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
-            "pubEndDate": end.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+            "startIndex": str(index),
+            "pubStartDate": window[0].strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+            "pubEndDate": window[1].strftime("%Y-%m-%dT%H:%M:%S.000Z"),
             "orderBy": "publishedDate",
             "sortOrder": "DESC",
         }
-        
-        try:
-            payload = _fetch_json(base_url, user_agent=user_agent, params=params, api_key=api_key)
-            vulnerabilities_batch = payload.get("vulnerabilities", [])
-            
-            # Set total_results from first response
-            if total_results is None:
-                total_results = payload.get("totalResults", 0)
-                date_range_str = f"{start_date} to {end_date}" if start_date and end_date else f"{start.strftime('%Y-%m-%d')} to {end.strftime('%Y-%m-%d')}"
-                logger.info(f"NVD API reports {total_results} total CVEs in date range {date_range_str}")
+        # noRejected is a valueless flag, so the query string is built here
+        # rather than passed as params (httpx would also drop it from the URL)
+        url = f"{base_url}?noRejected&{urlencode(params)}"
+        meta: Dict[str, object] = {}
+        if _NVD_HTTP2_CLIENT is not None:
+            meta = _fetch_json(url, user_agent=user_agent, api_key=api_key, pacer=pacer, client=_NVD_HTTP2_CLIENT)
+            items = meta.get("vulnerabilities", [])
+        elif IJSON_AVAILABLE:
+            # Parse items as they stream in so only accepted CVEs are kept
+            items = _stream_json(url, path="vulnerabilities.item", user_agent=user_agent, api_key=api_key, meta=meta, pacer=pacer)
+        else:
+            meta = _fetch_json(url, user_agent=user_agent, api_key=api_key, pacer=pacer)
+            items = meta.get("vulnerabilities", [])
+        page_size = 0
+        accepted: List[dict] = []
+        skipped: Dict[str, int] = {}
+        for item in items:
+            page_size += 1
+            status = item.get("cve", {}).get("vulnStatus")
+            if status in ALLOWED_NVD_STATUSES:
+                accepted.append(item)
+            else:
+                skipped[status or "unknown"] = skipped.get(status or "unknown", 0) + 1
+        return meta.get("totalResults", 0), page_size, accepted, skipped
+
+    fetcher = ThreadPoolExecutor(max_workers=len(windows), thread_name_prefix="nvd-fetch")
+
+    def schedule(window: Tuple[dt.datetime, dt.datetime], index: int, delay: float = 0.0) -> Future:
+        nonlocal next_submit
+        next_submit = max(time.monotonic() + delay, next_submit + pacer.delay)
+        return fetcher.submit(fetch_page, window, index, next_submit)
+
+    try:
+        # Request the first page of every window up front; later pages of the
+        # window being consumed are prefetched while the current page is processed.
+        first_pages = [schedule(window, 0) for window in windows]
+        for window, pending in zip(windows, first_pages):
+            window_str = f"{window[0].strftime('%Y-%m-%d')} to {window[1].strftime('%Y-%m-%d')}"
+            start_index = 0
+            total_results = None
+            page_attempts = 0
+            while pending is not None:
+                try:
+                    page_total, page_size, accepted, skipped = pending.result()
+                    pending = None
+                    
+                    # Set total_results from the window's first response
+                    if total_results is None:
+                        total_results = page_total
+                        logger.info(f"NVD API reports {total_results} CVEs in date range {window_str}")
+                    
+                    if not page_size:
+                        break
+                    
+                    pages_fetched += 1
+                    page_attempts = 0
+                except Exception as e:
+                    page_number = start_index // results_per_page + 1
+                    if page_attempts < NVD_PAGE_RETRIES:
+                        # Request the same page again so every run covers the same records
+                        page_attempts += 1
+                        delay = 2 ** page_attempts
+                        logger.warning(f"Error fetching NVD page {page_number} for {window_str}: {e}; retrying in {delay}s (attempt {page_attempts}/{NVD_PAGE_RETRIES})")
+                        pending = schedule(window, start_index, delay=delay)
+                        continue
+                    page_attempts = 0
+                    # Out of retries: a failed first page leaves no page count, so skip the window
+                    if total_results is None:
+                        logger.warning(f"Giving up on NVD date range {window_str}: {e}")
+                        break
+                    logger.warning(f"Giving up on NVD page {page_number} for {window_str}: {e}")
+                    start_index += results_per_page
+                    if start_index >= total_results:
+                        break
+                    pending = schedule(window, start_index)
+                    continue
                 
-                # Warn if no results but we're querying a valid date range
-                if total_results == 0 and days_diff > 0:
-                    logger.warning(f"NVD API returned 0 results for date range {date_range_str}. This might indicate:")
-                    logger.warning("  - API rate limiting (try adding NVD_API_KEY)")
-                    logger.warning("  - Date range too old (NVD may have limited historical data)")
-                    logger.warning("  - Network/API issues")
-            
-            if not vulnerabilities_batch:
-                logger.info(f"No more CVEs to fetch (page {pages_fetched + 1})")
-                break
-            
-            all_vulnerabilities.extend(vulnerabilities_batch)
-            pages_fetched += 1
-            
-            # Log progress every 5 pages
-            if pages_fetched % 5 == 0:
-                filtered_count = sum(1 for item in all_vulnerabilities 
-                                   if item.get("cve", {}).get("vulnStatus") in ALLOWED_NVD_STATUSES)
-                logger.info(f"Fetched {pages_fetched} pages, {len(all_vulnerabilities)} total CVEs, {filtered_count} analyzed")
-            
-            # Check if we've fetched all available results
-            if total_results > 0:
-                if start_index + len(vulnerabilities_batch) >= total_results:
-                    logger.info(f"Fetched all {total_results} CVEs from NVD API")
-                    break
-                # Also check if we got fewer results than expected (last page)
-                if len(vulnerabilities_batch) < results_per_page:
-                    logger.info(f"Reached last page (got {len(vulnerabilities_batch)} CVEs, expected up to {results_per_page})")
+                # Prefetch the window's next page unless this was its last one
+                if total_results > 0 and (
+                    start_index + page_size >= total_results
+                    or page_size < results_per_page
+                ):
+                    logger.debug(f"Fetched all {total_results} CVEs in date range {window_str}")
+                else:
+                    start_index += results_per_page
+                    pending = schedule(window, start_index)
+                
+                seen += page_size
+                for status, count in skipped.items():
+                    status_counts[status] = status_counts.get(status, 0) + count
+                
+                for item in accepted:
+                    record = _nvd_to_record(item)
+                    if record is None:
+                        continue
+                    yield record
+                    emitted += 1
+                    if emitted >= target_limit:
+                        break
+
+                # Log progress every 5 pages
+                if pages_fetched % 5 == 0:
+                    logger.info(f"Fetched {pages_fetched} pages, {seen} total CVEs, {emitted} analyzed")
+                
+                if emitted >= target_limit:
                     break
             
-            # Check if we have enough filtered results (but continue fetching if there are more pages)
-            filtered_count = sum(1 for item in all_vulnerabilities 
-                               if item.get("cve", {}).get("vulnStatus") in ALLOWED_NVD_STATUSES)
-            # Only stop early if we have enough AND we're past a reasonable number of pages
-            # This ensures we fetch historical data even if limit is reached early
-            if filtered_count >= target_limit and pages_fetched >= 5:
+            if emitted >= target_limit:
                 logger.info(f"Reached target limit of {target_limit} analyzed CVEs after {pages_fetched} pages")
                 break
-            
-            start_index += results_per_page
-            
-            # Rate limiting - small delay between requests to avoid hitting API limits
-            import time
-            time.sleep(0.6)  # NVD API recommends 0.6s between requests
-        except Exception as e:
-            logger.warning(f"Error fetching NVD page {pages_fetched + 1}: {e}")
-            # Don't break immediately - try to continue if it's a transient error
-            if pages_fetched == 0:
-                # If first page fails, break
-                break
-            # Otherwise, log and continue (might be rate limit)
-            import time
-            time.sleep(2)  # Longer delay on error
-            start_index += results_per_page
+    finally:
+        fetcher.shutdown(wait=False, cancel_futures=True)
     
-    # Filter to only "Analyzed" or "Modified" status, then limit
-    filtered = []
-    for item in all_vulnerabilities:
-        cve = item.get("cve", {})
-        status = cve.get("vulnStatus")
-        if status in ALLOWED_NVD_STATUSES:
-            filtered.append(item)
-        if len(filtered) >= target_limit:
-            break
+    if seen == 0 and days_diff > 0:
+        date_range_str = f"{start.strftime('%Y-%m-%d')} to {end.strftime('%Y-%m-%d')}"
+        logger.warning(f"NVD API returned 0 results for date range {date_range_str}. This might indicate:")
+        logger.warning("  - API rate limiting (try adding NVD_API_KEY)")
+        logger.warning("  - Date range too old (NVD may have limited historical data)")
+        logger.warning("  - Network/API issues")
     
-    vulnerabilities = filtered
-    logger.info(f"Fetched {len(all_vulnerabilities)} total CVEs, filtered to {len(vulnerabilities)} analyzed CVEs")
+    logger.info(f"Fetched {seen} total CVEs, emitted {emitted} analyzed CVEs")
     
     # If we got very few results, log a warning
-    if len(vulnerabilities) == 0 and len(all_vulnerabilities) > 0:
-        status_counts = {}
-        for item in all_vulnerabilities[:100]:  # Sample first 100
-            status = item.get("cve", {}).get("vulnStatus", "unknown")
-            status_counts[status] = status_counts.get(status, 0) + 1
+    if emitted == 0 and seen > 0:
         logger.warning(f"No analyzed CVEs found. Status distribution: {status_counts}")
-    elif len(vulnerabilities) == 0:
+    elif emitted == 0:
         logger.warning(f"No CVEs fetched from NVD API. Check API key and date range.")
 
-    for item in vulnerabilities:
-        cve = item.get("cve", {})
-        cve_id = cve.get("id")
-        if not cve_id:
-            continue
-
-        descriptions = cve.get("descriptions", [])
-        metrics = cve.get("metrics", {})
-        status = cve.get("vulnStatus")
-
-        if status and status not in ALLOWED_NVD_STATUSES:
-            logger.debug("Skipping CVE %s with status %s", cve_id, status)
-            continue
-
-        severity = None
-        score = None
-
-        for key in ("cvssMetricV40", "cvssMetricV31", "cvssMetricV30", "cvssMetricV3", "cvssMetricV2"):
-            metric_list = metrics.get(key)
-            if metric_list:
-                metric = metric_list[0]
-                data = metric.get("cvssData", {})
-                severity = metric.get("baseSeverity") or data.get("baseSeverity") or severity
-                score = data.get("baseScore") or score
-                break
-
-        # If severity is missing but we have a CVSS score, determine severity from score
-        if not severity and score is not None:
-            try:
-                score_float = float(score)
-                if score_float >= 9.0:
-                    severity = "CRITICAL"
-                elif score_float >= 7.0:
-                    severity = "HIGH"
-                elif score_float >= 4.0:
-                    severity = "MEDIUM"
-                else:
-                    severity = "LOW"
-            except (ValueError, TypeError):
-                pass
-
-        # Normalize severity to lowercase for consistency
-        if severity:
-            severity = severity.lower()
-
-        record = CrawlerRecord(
-            id=cve_id,
-            source="nvd",
-            title=cve_id,
-            url=f"https://www.cve.org/CVERecord?id={cve_id}",
-            summary=descriptions[0].get("value", "") if descriptions else "",
-            published=cve.get("published"),
-            severity=severity,
-            status=status,
-            metadata={"cvss_score": str(score) if score is not None else ""},
-        )
-        yield record
-
 
 def crawl_cisa_kev(limit: int = 20, *, user_agent: str, start_date: str = None, end_date: str = None) -> Iterable[CrawlerRecord]:
     """Fetch known exploited vulnerabilities from CISA.
@@ -294,44 +694,26 @@ def crawl_cisa_kev(limit: int = 20, *, user_agent: str, start_date: str = None,
     """
 
     url = "https://www.cisa.gov/sites/default/files/feeds/known_exploited_vulnerabilities.json"
-    payload = _fetch_json(url, user_agent=user_agent)
+    payload = _fetch_json_cached(url, "cisa_kev", user_agent=user_agent)
     all_vulns = payload.get("vulnerabilities", [])
     
-    # Filter by date range if provided
-    if start_date or end_date:
-        filtered_vulns = []
-        for vuln in all_vulns:
-            date_added = vuln.get("dateAdded", "")
-            if not date_added:
-                continue
-            
-            try:
-                vuln_date = dt.datetime.strptime(date_added[:10], "%Y-%m-%d").date()
-                
-                if start_date:
-                    start = dt.datetime.strptime(start_date, "%Y-%m-%d").date()
-                    if vuln_date < start:
-                        continue
-                
-                if end_date:
-                    end = dt.datetime.strptime(end_date, "%Y-%m-%d").date()
-                    if vuln_date > end:
-                        continue
-                
-                filtered_vulns.append(vuln)
-            except ValueError:
-                # Skip if date parsing fails
-                continue
-        
-        all_vulns = filtered_vulns
+    start, end = _date_bounds(start_date, end_date)
     
-    # Sort by dateAdded (most recent first) to get newest additions
-    sorted_vulns = sorted(
-        all_vulns,
-        key=lambda x: x.get("dateAdded", ""),
-        reverse=True
-    )
-    vulns = sorted_vulns[:limit]
+    def in_range(vuln: dict) -> bool:
+        date_added = vuln.get("dateAdded", "")
+        if not date_added:
+            return False
+        try:
+            vuln_date = dt.date.fromisoformat(date_added[:10])
+        except ValueError:
+            # Skip if date parsing fails
+            return False
+        return (start is None or vuln_date >= start) and (end is None or vuln_date <= end)
+    
+    # Filter by date range if provided and keep only the newest additions
+    # (top-k selection instead of sorting the whole catalog)
+    candidates = (vuln for vuln in all_vulns if in_range(vuln)) if start or end else all_vulns
+    vulns = heapq.nlargest(limit, candidates, key=lambda x: x.get("dateAdded", ""))
 
     for item in vulns:
         cve_id = item.get("cveID", item.get("vulnerabilityName", ""))
@@ -371,16 +753,12 @@ def crawl_reddit_netsec(limit: int = 10, *, user_agent: str) -> Iterable[Crawler
 
     for post in posts:
         data = post.get("data", {})
-        # Determine severity based on keywords in title/content
-        title_lower = data.get("title", "").lower()
-        content_lower = data.get("selftext", "").lower()
-        combined = f"{title_lower} {content_lower}"
-        
-        severity = "medium"  # Default for Reddit posts
-        if any(word in combined for word in ["critical", "0-day", "zero-day", "rce", "remote code execution"]):
-            severity = "high"
-        elif any(word in combined for word in ["exploit", "poc", "proof of concept", "cve-"]):
+        # Determine severity based on keywords in title/content, one regex pass each
+        # without building lowercased copies of the post body
+        if _HIGH_RE.search(data.get("title", "")) or _HIGH_RE.search(data.get("selftext", "")):
             severity = "high"
+        else:
+            severity = "medium"  # Default for Reddit posts
         
         record = CrawlerRecord(
             id=str(data.get("id")),
@@ -406,6 +784,7 @@ def crawl_github_advisories(limit: int = 20, *, user_agent: str, start_date: str
         params = {"per_page": min(limit, 30), "path": "advisories/github-reviewed"}
         
         payload = _fetch_json(api_url, user_agent=user_agent, params=params)
+        start, end = _date_bounds(start_date, end_date)
         
         count = 0
         for commit in payload:
@@ -417,35 +796,27 @@ def crawl_github_advisories(limit: int = 20, *, user_agent: str, start_date: str
             date = commit_data.get("author", {}).get("date", "")
             
             # Filter by date if provided
-            if start_date or end_date:
+            if start or end:
                 try:
-                    commit_dt = dt.datetime.fromisoformat(date.replace('Z', '+00:00'))
-                    if start_date:
-                        start_dt = dt.datetime.strptime(start_date, "%Y-%m-%d")
-                        if commit_dt.date() < start_dt.date():
-                            continue
-                    if end_date:
-                        end_dt = dt.datetime.strptime(end_date, "%Y-%m-%d")
-                        if commit_dt.date() > end_dt.date():
-                            continue
-                except (ValueError, AttributeError):
+                    commit_date = dt.date.fromisoformat(date[:10])
+                    if start and commit_date < start:
+                        continue
+                    if end and commit_date > end:
+                        continue
+                except (ValueError, TypeError):
                     pass
             
             # Extract CVE/GHSA ID
-            cve_id = None
-            if "CVE-" in message:
-                import re
-                match = re.search(r'CVE-\d{4}-\d+', message)
-                if match:
-                    cve_id = match.group(0)
+            match = _CVE_RE.search(message)
+            cve_id = match.group(0) if match else None
             
             if cve_id or "GHSA-" in message or "advisory" in message.lower():
                 # GitHub advisories are typically high severity
                 severity = "high"
                 message_lower = message.lower()
-                if any(word in message_lower for word in ["critical", "critical severity", "cvss:3.1/av:n"]):
+                if _GH_CRITICAL_RE.search(message_lower):
                     severity = "critical"
-                elif any(word in message_lower for word in ["low", "low severity"]):
+                elif _GH_LOW_RE.search(message_lower):
                     severity = "low"
                 
                 record = CrawlerRecord(
@@ -492,7 +863,7 @@ def crawl_abuse_ch_urlhaus(limit: int = 20, *, user_agent: str) -> Iterable[Craw
                 date_added = item.get("date_added", "")
                 
                 record = CrawlerRecord(
-                    id=f"urlhaus-{item.get('id', item.get('urlhash', str(hash(url_entry))))}",
+                    id=f"urlhaus-{item.get('id') or item.get('urlhash') or _content_hash(url_entry)}",
                     source="abuse_ch_urlhaus",
                     title=f"Malware URL: {threat}",
                     url=url_entry or "https://urlhaus.abuse.ch/",
@@ -581,73 +952,77 @@ def crawl_abuse_ch_threatfox(limit: int = 20, *, user_agent: str) -> Iterable[Cr
         return
 
 
+@lru_cache(maxsize=256)
+def _rss_date(value: str) -> Optional[dt.date]:
+    """Parse an RFC 822 RSS ``pubDate`` into a UTC date (None if unparseable)."""
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(dt.timezone.utc)
+    return parsed.date()
+
+
 def crawl_exploit_db(limit: int = 15, *, user_agent: str, start_date: str = None, end_date: str = None) -> Iterable[CrawlerRecord]:
     """Fetch recent exploits from Exploit-DB."""
     
-    try:
-        import feedparser
-    except ImportError:
-        logger.error("feedparser not installed. Install with: pip install feedparser")
-        return
+    start, end = _date_bounds(start_date, end_date)
     
     try:
         feed_url = "https://www.exploit-db.com/rss.xml"
-        feed = feedparser.parse(feed_url)
-        
-        if feed.bozo and feed.bozo_exception:
-            logger.warning(f"Exploit-DB RSS parse error: {feed.bozo_exception}")
-        
-        if not feed.entries:
-            logger.warning(f"Exploit-DB returned no entries")
-            return
+        response = _request("GET", feed_url, headers={"User-Agent": user_agent}, timeout=DEFAULT_TIMEOUT, stream=True)
+        response.raw.decode_content = True
         
         count = 0
+        total_entries = 0
         skipped_by_date = 0
-        for entry in feed.entries:
-            if count >= limit:
-                break
-            
-            # Filter by date if provided
-            if start_date or end_date:
-                entry_date = entry.get("published_parsed")
-                if entry_date:
-                    try:
-                        entry_dt = dt.datetime(*entry_date[:6])
-                        if start_date:
-                            start_dt = dt.datetime.strptime(start_date, "%Y-%m-%d")
-                            if entry_dt.date() < start_dt.date():
-                                skipped_by_date += 1
-                                continue
-                        if end_date:
-                            end_dt = dt.datetime.strptime(end_date, "%Y-%m-%d")
-                            if entry_dt.date() > end_dt.date():
-                                skipped_by_date += 1
-                                continue
-                    except (ValueError, TypeError) as e:
-                        logger.debug(f"Date parsing error for Exploit-DB entry: {e}")
-                        pass
-                else:
-                    # If no date filter, include it
-                    pass
-            
-            record = CrawlerRecord(
-                id=entry.get("id", "").split("/")[-1] or str(count),
-                source="exploit_db",
-                title=entry.get("title", ""),
-                url=entry.get("link", ""),
-                summary=entry.get("summary", "")[:300] if entry.get("summary") else "",
-                published=entry.get("published", ""),
-                severity="high",
-                metadata={
-                    "author": entry.get("author", ""),
-                    "platform": entry.get("tags", [{}])[0].get("term", "") if entry.get("tags") else "",
-                },
-            )
-            yield record
-            count += 1
+        with response:
+            # Parse the RSS stream item by item, clearing each element once used
+            for _, elem in ET.iterparse(response.raw, events=("end",)):
+                if elem.tag != "item":
+                    continue
+                total_entries += 1
+                
+                published = elem.findtext("pubDate", "")
+                
+                # Filter by date if provided
+                if (start or end) and published:
+                    entry_date = _rss_date(published)
+                    if entry_date is None:
+                        logger.debug(f"Date parsing error for Exploit-DB entry: {published!r}")
+                    elif (start and entry_date < start) or (end and entry_date > end):
+                        skipped_by_date += 1
+                        elem.clear()
+                        continue
+                
+                summary = elem.findtext("description") or ""
+                record = CrawlerRecord(
+                    id=(elem.findtext("guid") or "").split("/")[-1] or str(count),
+                    source="exploit_db",
+                    title=elem.findtext("title", ""),
+                    url=elem.findtext("link", ""),
+                    summary=summary[:300],
+                    published=published,
+                    severity="high",
+                    metadata={
+                        "author": elem.findtext(_DC_CREATOR) or elem.findtext("author", ""),
+                        "platform": elem.findtext("category", ""),
+                    },
+                )
+                elem.clear()
+                yield record
+                count += 1
+                if count >= limit:
+                    break
         
-        if count == 0:
-            logger.warning(f"Exploit-DB: No records returned. Total entries: {len(feed.entries)}, skipped by date: {skipped_by_date}")
+        if total_entries == 0:
+            logger.warning(f"Exploit-DB returned no entries")
+        elif count == 0:
+            logger.warning(f"Exploit-DB: No records returned. Total entries: {total_entries}, skipped by date: {skipped_by_date}")
+    except ET.ParseError as e:
+        logger.warning(f"Exploit-DB RSS parse error: {e}")
+        return
     except Exception as e:
         logger.error(f"Exploit-DB fetch failed: {e}", exc_info=True)
         return
@@ -662,9 +1037,8 @@ def crawl_malwarebazaar(limit: int = 15, *, user_agent: str) -> Iterable[Crawler
         headers = {"User-Agent": user_agent}
         data = {"query": "get_recent", "selector": "time"}
         
-        response = requests.post(url, headers=headers, data=data, timeout=30)
-        response.raise_for_status()
-        payload = response.json()
+        response = _request("POST", url, headers=headers, data=data, timeout=30)
+        payload = _json_loads(response.content)
         
         query_status = payload.get("query_status", "")
         if query_status != "ok":
@@ -687,7 +1061,7 @@ def crawl_malwarebazaar(limit: int = 15, *, user_agent: str) -> Iterable[Crawler
                 first_seen = sample.get("first_seen", "")
                 
                 record = CrawlerRecord(
-                    id=sha256[:16] if sha256 else sample.get("id", str(hash(str(sample)))),
+                    id=sha256[:16] if sha256 else sample.get("id") or _content_hash(sample),
                     source="malwarebazaar",
                     title=f"Malware Sample: {malware_type}",
                     url=f"https://bazaar.abuse.ch/sample/{sha256}/" if sha256 else "https://bazaar.abuse.ch/",
@@ -714,6 +1088,51 @@ def crawl_malwarebazaar(limit: int = 15, *, user_agent: str) -> Iterable[Crawler
         return
 
 
+def _seen_db() -> sqlite3.Connection:
+    SEEN_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(SEEN_DB_PATH, timeout=30)
+    db.execute("CREATE TABLE IF NOT EXISTS seen (key TEXT PRIMARY KEY, digest TEXT NOT NULL, seen_at INTEGER NOT NULL)")
+    return db
+
+
+def _drop_seen(records: Dict[str, CrawlerRecord]) -> Dict[str, CrawlerRecord]:
+    """Keep records that are new or changed since an earlier run, and checkpoint them.
+
+    A failing checkpoint store never loses data: every record is kept.
+    """
+    digests = {key: _content_hash(_to_dict(record)) for key, record in records.items()}
+    keys = list(digests)
+    try:
+        with closing(_seen_db()) as db, db:
+            known = {}
+            for offset in range(0, len(keys), 500):  # Stay under SQLite's bound-variable limit
+                chunk = keys[offset:offset + 500]
+                placeholders = ",".join("?" * len(chunk))
+                known.update(db.execute(f"SELECT key, digest FROM seen WHERE key IN ({placeholders})", chunk))
+            fresh = [key for key in keys if known.get(key) != digests[key]]
+            now = int(time.time())
+            db.executemany("INSERT OR REPLACE INTO seen VALUES (?, ?, ?)", ((key, digests[key], now) for key in fresh))
+    except sqlite3.Error as exc:
+        logger.warning(f"Seen-record checkpoint unavailable, emitting all records: {exc}")
+        return records
+    return {key: records[key] for key in fresh}
+
+
+def forget_records(keys: Optional[Iterable[str]] = None) -> None:
+    """Drop ``source:id`` keys (or all of them) from the checkpoint so they are emitted again.
+
+    Call this when emitted records were not stored, or the threat database was cleared.
+    """
+    try:
+        with closing(_seen_db()) as db, db:
+            if keys is None:
+                db.execute("DELETE FROM seen")
+            else:
+                db.executemany("DELETE FROM seen WHERE key = ?", ((key,) for key in keys))
+    except sqlite3.Error as exc:
+        logger.warning(f"Could not reset seen-record checkpoint: {exc}")
+
+
 def run_crawler(start_date: str = None, end_date: str = None) -> Dict[str, object]:
     """Main entrypoint invoked by the FastAPI endpoint.
     
@@ -722,10 +1141,12 @@ def run_crawler(start_date: str = None, end_date: str = None) -> Dict[str, objec
         end_date: End date in YYYY-MM-DD format (optional)
     """
 
+    started = time.perf_counter()
     user_agent = os.environ.get("CRAWLER_USER_AGENT", DEFAULT_USER_AGENT)
 
     logs: List[CrawlerLog] = []
-    records: List[CrawlerRecord] = []
+    unique_records: Dict[str, CrawlerRecord] = {}
+    total_items = 0
     
     # Calculate date range and adjust limits
     if start_date and end_date:
@@ -780,27 +1201,44 @@ def run_crawler(start_date: str = None, end_date: str = None) -> Dict[str, objec
 
     logs.append(_log(f"Starting crawler run (8 sources: NVD, CISA KEV, Reddit, GitHub, Abuse.ch, Exploit-DB, MalwareBazaar){date_range_msg}", "info"))
 
-    for label, handler, kwargs in sources:
-        logs.append(_log(f"Fetching data from {label}", "info"))
-        try:
-            fetched = list(handler(user_agent=user_agent, **kwargs))
-            records.extend(fetched)
-            logs.append(_log(f"Collected {len(fetched)} items from {label}", "success"))
-        except requests.HTTPError as exc:
-            logs.append(_log(f"HTTP error while fetching {label}: {exc}", "error"))
-        except requests.RequestException as exc:
-            logs.append(_log(f"Network error while fetching {label}: {exc}", "error"))
-        except Exception as exc:  # pylint: disable=broad-except
-            logs.append(_log(f"Unexpected error while fetching {label}: {exc}", "error"))
+    # Each crawler is a generator bound to a different host; materialise them
+    # concurrently so the run takes as long as the slowest source.
+    fetched_by_label: Dict[str, List[CrawlerRecord]] = {}
+    with ThreadPoolExecutor(max_workers=min(len(sources), MAX_SOURCE_WORKERS), thread_name_prefix="crawler") as executor:
+        futures = {}
+        for label, handler, kwargs in sources:
+            logs.append(_log(f"Fetching data from {label}", "info"))
+            futures[executor.submit(list, handler(user_agent=user_agent, **kwargs))] = label
 
-    unique_records: Dict[str, CrawlerRecord] = {}
-    for record in records:
-        unique_records.setdefault(f"{record.source}:{record.id}", record)
+        for future in as_completed(futures):
+            label = futures[future]
+            try:
+                fetched = future.result()
+                fetched_by_label[label] = fetched
+                logs.append(_log(f"Collected {len(fetched)} items from {label}", "success"))
+            except requests.HTTPError as exc:
+                logs.append(_log(f"HTTP error while fetching {label}: {exc}", "error"))
+            except requests.RequestException as exc:
+                logs.append(_log(f"Network error while fetching {label}: {exc}", "error"))
+            except Exception as exc:  # pylint: disable=broad-except
+                logs.append(_log(f"Unexpected error while fetching {label}: {exc}", "error"))
+
+    # Dedup while merging, in source order so output ordering stays deterministic
+    for label, _, _ in sources:
+        fetched = fetched_by_label.get(label, ())
+        total_items += len(fetched)
+        for record in fetched:
+            unique_records.setdefault(f"{record.source}:{record.id}", record)
 
     # Calculate final stats
-    total_items = len(records)
     unique_items = len(unique_records)
-    successful_sources = sum(1 for log in logs if log.type == "success" and "Collected" in log.message)
+    successful_sources = len(fetched_by_label)
+
+    skipped_seen = 0
+    if SKIP_SEEN_RECORDS:
+        unique_records = _drop_seen(unique_records)
+        skipped_seen = unique_items - len(unique_records)
+        logs.append(_log(f"Skipped {skipped_seen} records unchanged since the last run", "info"))
     
     # Add completion log with summary
     logs.append(
@@ -811,28 +1249,27 @@ def run_crawler(start_date: str = None, end_date: str = None) -> Dict[str, objec
     )
     
     # Add final summary log
-    logs.append(
-        _log(
-            f"Crawler run completed at {dt.datetime.utcnow().isoformat()}Z. Total execution time: {len(logs)} log entries processed.",
-            "info",
-        )
-    )
+    logs.append(_log(f"Crawler run completed in {time.perf_counter() - started:.1f}s.", "info"))
 
-    serialised_records = [record.__dict__ for record in unique_records.values()]
+    serialised_records = [_to_dict(record) for record in unique_records.values()]
 
     return {
-        "logs": [log.__dict__ for log in logs],
+        "logs": [_to_dict(log) for log in logs],
         "records": serialised_records,
         "stats": {
             "sources": successful_sources,  # Count successful sources, not total attempted
             "items_total": total_items,
             "items_unique": unique_items,
+            "items_new": len(unique_records),
+            "items_skipped_seen": skipped_seen,
         },
     }
 
 
 __all__ = [
     "run_crawler", 
+    "close_session",
+    "forget_records",
     "crawl_nvd_recent", 
     "crawl_cisa_kev", 
     "crawl_reddit_netsec",
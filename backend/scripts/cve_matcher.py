@@ -4,18 +4,76 @@ Matches detected website technologies against CVE database.
 """
 
 import logging
+import multiprocessing
+import os
 import re
-from typing import Dict, List, Optional
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
 from data_layer.neo4j_connector import Neo4jConnector
 
 logger = logging.getLogger(__name__)
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+SEVERITY_ORDER = {'critical': 4, 'high': 3, 'medium': 2, 'low': 1}
+
+# Separators dropped from technology names to build their "clean" variants
+_NAME_SEPARATORS = str.maketrans('', '', '.-')
+_TERM_SEPARATORS = str.maketrans('', '', '.-_')
+
+# Common generic terms that shouldn't trigger matches
+GENERIC_TERMS = {'cloudflare', 'cdn', 'proxy', 'server', 'web', 'http', 'https'}
+
+# Text matching is spread over worker processes only for very large CVE sets;
+# below this the pickling/IPC overhead outweighs the extra cores.
+PARALLEL_MATCH_MIN_CVES = 50_000
+PARALLEL_MATCH_CHUNK = 5_000
+
+_match_pool: Optional[ProcessPoolExecutor] = None
+_match_pool_lock = threading.Lock()
+
+# CVE index of the most recently indexed stored graph, shared by every
+# CVEMatcher so per-request matchers over an unchanged graph skip the rebuild:
+# (connector snapshot key, nodes, severity ranks, search texts)
+_shared_cve_index: Optional[tuple] = None
+_shared_cve_index_lock = threading.Lock()
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+def _at_word_boundary(text: str, index: int) -> bool:
+    """Same test as regex ``\\b``: word-ness differs on either side of ``index``."""
+    before = index > 0 and _is_word_char(text[index - 1])
+    after = index < len(text) and _is_word_char(text[index])
+    return before != after
+
 
 class CVEMatcher:
     """Matches website technologies against CVE database."""
     
+    # Set once the Neo4j full-text index has been ensured for this process
+    _search_index_ready = False
+    
     def __init__(self):
         self.connector = Neo4jConnector()
+        # CVE nodes with their severity ranks and lowercased search text,
+        # rebuilt when the graph's snapshot or write_version moves
+        self._cve_nodes: List = []
+        self._cve_ranks = np.zeros(0, dtype=np.uint8)
+        self._cve_texts: List[str] = []
+        self._cve_cache_version = None
     
     def find_matching_cves(
         self, 
@@ -32,14 +90,17 @@ class CVEMatcher:
         Returns:
             List of matching CVE dictionaries
         """
-        matching_cves = []
+        # A live Neo4j graph isn't mirrored into connector.nodes
+        if not self.connector.simulation_mode:
+            return self._find_matching_cves_indexed(technologies, min_severity)
         
-        # Get all CVE nodes from database
-        all_cves = self._get_all_cves()
+        # Index CVE nodes from database
+        self._refresh_cve_cache()
+        total_cves = len(self._cve_nodes)
         
-        logger.info(f"Total CVEs in database: {len(all_cves)}")
+        logger.info(f"Total CVEs in database: {total_cves}")
         
-        if len(all_cves) == 0:
+        if total_cves == 0:
             logger.warning("No CVEs found in database. Run crawler first to populate CVEs.")
             return []
         
@@ -48,140 +109,272 @@ class CVEMatcher:
         
         logger.info(f"Searching for CVEs matching {len(tech_names)} technologies: {tech_names[:5]}...")
         
-        # Match CVEs against technologies
-        for cve in all_cves:
-            if self._matches_technology(cve, tech_names, technologies, min_severity):
-                matching_cves.append(cve)
+        # Build the term set (and matcher) once, not per CVE
+        terms = self._match_terms(tech_names)
+        automaton, term_pattern = self._build_matcher(terms)
+        
+        # Severity filter over the whole rank array, then text-match the survivors
+        min_rank = SEVERITY_ORDER.get(min_severity, 0)
+        candidates = np.flatnonzero(self._cve_ranks >= min_rank)
+        if terms and len(candidates) >= PARALLEL_MATCH_MIN_CVES:
+            matched = self._match_in_pool(terms, candidates)
+        else:
+            matched = [
+                index for index in candidates
+                if self._matches_technology(self._cve_texts[index], term_pattern, automaton)
+            ]
+        
+        # Only matches are turned into result dicts
+        matching_cves = [self._node_to_cve(self._cve_nodes[index]) for index in matched]
         
         # Sort by severity and CVSS score
         matching_cves = self._sort_by_severity(matching_cves)
         
-        logger.info(f"Found {len(matching_cves)} matching CVEs (out of {len(all_cves)} total CVEs in database)")
+        logger.info(f"Found {len(matching_cves)} matching CVEs (out of {total_cves} total CVEs in database)")
         
         return matching_cves
     
-    def _get_all_cves(self) -> List[Dict]:
-        """Get all CVE nodes from database."""
-        cves = []
+    def _match_in_pool(self, terms: List[str], candidates: np.ndarray) -> List[int]:
+        """Text-match candidate CVEs in worker processes, keeping candidate order."""
+        chunks = [candidates[start:start + PARALLEL_MATCH_CHUNK]
+                  for start in range(0, len(candidates), PARALLEL_MATCH_CHUNK)]
+        try:
+            pool = _get_match_pool()
+            futures = [
+                pool.submit(_match_texts, tuple(terms), [self._cve_texts[index] for index in chunk])
+                for chunk in chunks
+            ]
+            return [int(chunk[offset]) for chunk, future in zip(chunks, futures) for offset in future.result()]
+        except Exception as e:
+            logger.warning(f"Parallel CVE matching failed ({e}); matching in-process")
+            close_match_pool()  # A broken pool is recreated on next use
+            automaton, term_pattern = self._build_matcher(terms)
+            return [
+                index for index in candidates
+                if self._matches_technology(self._cve_texts[index], term_pattern, automaton)
+            ]
+    
+    def _find_matching_cves_indexed(
+        self, 
+        technologies: Dict[str, List[Dict]], 
+        min_severity: str
+    ) -> List[Dict]:
+        """Let the Neo4j full-text index pick candidates, then confirm them with the word-boundary matcher."""
+        if not CVEMatcher._search_index_ready:
+            CVEMatcher._search_index_ready = self.connector.ensure_cve_search_index()
         
+        terms = self._match_terms(self._extract_tech_names(technologies))
+        automaton, term_pattern = self._build_matcher(terms)
+        
+        min_rank = SEVERITY_ORDER.get(min_severity, 0)
+        severities = [name for name, rank in SEVERITY_ORDER.items() if rank >= min_rank] if min_rank else None
+        
+        matching_cves = []
+        for node in self.connector.search_cves(terms, severities):
+            cve = self._node_to_cve(node)
+            if self._matches_technology(self._search_text(cve), term_pattern, automaton):
+                matching_cves.append(cve)
+        
+        matching_cves = self._sort_by_severity(matching_cves)
+        
+        logger.info(f"Found {len(matching_cves)} matching CVEs via the Neo4j full-text index")
+        
+        return matching_cves
+    
+    @staticmethod
+    def _node_to_cve(node) -> Dict:
+        """Convert a CVE graph node into the dictionary returned to callers."""
+        return {
+            "id": node.node_id,
+            "cve_id": node.properties.get('name', node.node_id),
+            "title": node.properties.get('name', ''),
+            "description": node.properties.get('description', ''),
+            "severity": node.properties.get('severity', 'medium'),
+            "cvss_score": node.properties.get('cvss_score'),
+            "source": node.properties.get('source', ''),
+            "url": node.properties.get('url', ''),
+            "discovered": node.properties.get('discovered'),
+            "metadata": {k: v for k, v in node.properties.items() 
+                        if k not in ['name', 'description', 'severity', 'source', 'url', 'discovered']}
+        }
+    
+    @staticmethod
+    def _search_text(cve: Dict) -> str:
+        """Lowercased text a CVE is matched against."""
+        return ' '.join((cve['title'], cve['description'], cve['cve_id'], str(cve['metadata']))).lower()
+    
+    def _refresh_cve_cache(self) -> None:
+        """Index CVE nodes, their severity ranks and search text, unless the graph is unchanged.
+        
+        Connectors loaded from the same stored graph share one index across
+        matchers; one with unsaved writes gets its own, rebuilt per write.
+        """
+        global _shared_cve_index
+        snapshot = self.connector.snapshot_key()
+        version = snapshot if snapshot is not None else (None, self.connector.write_version)
+        if self._cve_cache_version == version:
+            return
+        
+        if snapshot is not None:
+            with _shared_cve_index_lock:
+                shared = _shared_cve_index
+            if shared is not None and shared[0] == snapshot:
+                _, self._cve_nodes, self._cve_ranks, self._cve_texts = shared
+                self._cve_cache_version = version
+                return
+        
+        nodes, ranks, texts = [], [], []
         for node in self.connector.nodes.values():
             if node.node_type == 'CVE':
-                cve_data = {
-                    "id": node.node_id,
-                    "cve_id": node.properties.get('name', node.node_id),
-                    "title": node.properties.get('name', ''),
-                    "description": node.properties.get('description', ''),
-                    "severity": node.properties.get('severity', 'medium'),
-                    "cvss_score": node.properties.get('cvss_score'),
-                    "source": node.properties.get('source', ''),
-                    "url": node.properties.get('url', ''),
-                    "discovered": node.properties.get('discovered'),
-                    "metadata": {k: v for k, v in node.properties.items() 
-                                if k not in ['name', 'description', 'severity', 'source', 'url', 'discovered']}
-                }
-                cves.append(cve_data)
-        
-        return cves
+                cve = self._node_to_cve(node)
+                nodes.append(node)
+                ranks.append(SEVERITY_ORDER.get((cve['severity'] or 'medium').lower(), 0))
+                texts.append(self._search_text(cve))
+        
+        self._cve_nodes = nodes
+        self._cve_ranks = np.array(ranks, dtype=np.uint8)
+        self._cve_texts = texts
+        self._cve_cache_version = version
+        if snapshot is not None:
+            with _shared_cve_index_lock:
+                _shared_cve_index = (snapshot, nodes, self._cve_ranks, texts)
+    
+    def count_cves(self) -> int:
+        """Number of CVE nodes in the database."""
+        self._refresh_cve_cache()
+        return len(self._cve_nodes)
+    
+    def _get_all_cves(self) -> Iterator[Dict]:
+        """Yield every CVE node from database as a fresh dictionary."""
+        self._refresh_cve_cache()
+        for node in self._cve_nodes:
+            yield self._node_to_cve(node)
     
     def _extract_tech_names(self, technologies: Dict[str, List[Dict]]) -> List[str]:
         """Extract technology names from detected technologies."""
-        names = set()
-        
-        for category, techs in technologies.items():
-            for tech in techs:
-                name = tech.get('name', '').lower()
-                if name:
-                    names.add(name)
-                    # Also add variations
-                    names.add(name.replace('.', '').replace('-', ''))
-                    # Add versioned name if available
-                    if tech.get('version'):
-                        names.add(f"{name} {tech['version']}")
-        
+        names = {
+            variant
+            for techs in technologies.values()
+            for tech in techs
+            for variant in self._name_variants(tech)
+        }
         return list(names)
     
-    def _matches_technology(
-        self, 
-        cve: Dict, 
-        tech_names: List[str], 
-        technologies: Dict[str, List[Dict]],
-        min_severity: str
-    ) -> bool:
-        """Check if CVE matches any detected technology."""
-        # Check severity filter
-        severity_order = {'critical': 4, 'high': 3, 'medium': 2, 'low': 1}
-        cve_severity = cve.get('severity', 'medium').lower()
-        if severity_order.get(cve_severity, 0) < severity_order.get(min_severity, 0):
-            return False
-        
-        # Get CVE text for matching
-        cve_text = (
-            cve.get('title', '') + ' ' + 
-            cve.get('description', '') + ' ' +
-            cve.get('cve_id', '') + ' ' +
-            str(cve.get('metadata', {}))
-        ).lower()
-        
-        # Skip generic CVEs that don't mention specific technologies
-        # Common generic terms that shouldn't trigger matches
-        generic_terms = ['cloudflare', 'cdn', 'proxy', 'server', 'web', 'http', 'https']
+    @staticmethod
+    def _name_variants(tech: Dict) -> tuple:
+        """Name, name without dots/dashes, and versioned name of one technology."""
+        name = tech.get('name', '').lower()
+        if not name:
+            return ()
+        version = tech.get('version')
+        # Also add variations, plus the versioned name if available
+        variants = (name, name.translate(_NAME_SEPARATORS))
+        return variants + (f"{name} {version}",) if version else variants
+    
+    def _match_terms(self, tech_names: List[str]) -> List[str]:
+        """Expand technology names into the terms searched for in CVE text."""
+        terms = set()
         
-        # Match against technology names (strict matching)
         for tech_name in tech_names:
             tech_lower = tech_name.lower()
             
             # Skip generic terms unless they're part of a specific product
-            if tech_lower in generic_terms and len(tech_lower) < 8:
+            if tech_lower in GENERIC_TERMS and len(tech_lower) < 8:
                 continue
+            terms.add(tech_lower)
             
             # Remove common suffixes/prefixes for better matching
-            clean_tech = tech_lower.replace('.js', '').replace('.', '').replace('-', '').replace('_', '')
-            
-            # Only match if technology name appears in CVE description/title
-            # Use word boundaries to avoid partial matches
-            pattern = r'\b' + re.escape(tech_lower) + r'\b'
-            if re.search(pattern, cve_text):
-                return True
-            
-            # Also check clean version (without dots/dashes)
+            clean_tech = tech_lower.replace('.js', '').translate(_TERM_SEPARATORS)
             if len(clean_tech) > 3:  # Only for meaningful tech names
-                pattern_clean = r'\b' + re.escape(clean_tech) + r'\b'
-                if re.search(pattern_clean, cve_text):
+                terms.add(clean_tech)
+        
+        return sorted(terms)
+    
+    @staticmethod
+    def _build_matcher(terms: List[str]):
+        """Return ``(automaton, term_pattern)``; at most one of them is set."""
+        if not terms:
+            return None, None
+        if AHOCORASICK_AVAILABLE:
+            return CVEMatcher._build_automaton(terms), None
+        # One word-bounded alternation, so each CVE text is scanned once for all terms
+        alternation = '|'.join(re.escape(term) for term in sorted(terms, key=len, reverse=True))
+        return None, re.compile(r'\b(?:' + alternation + r')\b')
+    
+    @staticmethod
+    def _build_automaton(terms: List[str]):
+        """Build an Aho-Corasick automaton that finds every term in one pass."""
+        automaton = ahocorasick.Automaton()
+        for term in terms:
+            automaton.add_word(term, len(term))
+        automaton.make_automaton()
+        return automaton
+    
+    @staticmethod
+    def _matches_technology(
+        cve_text: str, 
+        term_pattern: Optional[re.Pattern], 
+        automaton=None
+    ) -> bool:
+        """Check if a CVE's lowercased search text mentions any detected technology."""
+        # Only match whole words to avoid partial matches
+        if automaton is not None:
+            for end, length in automaton.iter(cve_text):
+                if _at_word_boundary(cve_text, end + 1 - length) and _at_word_boundary(cve_text, end + 1):
                     return True
+            return False
         
-        # Match against specific technology versions (more strict)
-        for category, techs in technologies.items():
-            for tech in techs:
-                name = tech.get('name', '').lower()
-                version = tech.get('version')
-                
-                if name and name not in generic_terms:
-                    # Check if CVE mentions this specific technology
-                    name_pattern = r'\b' + re.escape(name) + r'\b'
-                    if re.search(name_pattern, cve_text):
-                        # If version is specified, prefer version-specific matches
-                        if version:
-                            version_pattern = rf'\b{re.escape(version)}\b'
-                            if re.search(version_pattern, cve_text):
-                                return True
-                        else:
-                            # No version specified, match if tech name found
-                            return True
-        
-        return False
+        return term_pattern is not None and term_pattern.search(cve_text) is not None
     
     def _sort_by_severity(self, cves: List[Dict]) -> List[Dict]:
         """Sort CVEs by severity (critical > high > medium > low) and CVSS score."""
-        severity_order = {'critical': 4, 'high': 3, 'medium': 2, 'low': 1}
-        
-        def sort_key(cve):
-            severity = cve.get('severity', 'medium').lower()
-            cvss = float(cve.get('cvss_score', 0)) if cve.get('cvss_score') else 0
-            return (severity_order.get(severity, 0), cvss)
-        
-        return sorted(cves, key=sort_key, reverse=True)
+        # Compute each key once up front; the sort itself only compares tuples
+        decorated = [
+            (
+                SEVERITY_ORDER.get((cve.get('severity') or 'medium').lower(), 0),
+                float(cve['cvss_score']) if cve.get('cvss_score') else 0.0,
+                cve
+            )
+            for cve in cves
+        ]
+        decorated.sort(key=itemgetter(0, 1), reverse=True)
+        return [cve for _, _, cve in decorated]
     
     def close(self):
         """Close database connection."""
         self.connector.close()
 
+
+def _get_match_pool() -> ProcessPoolExecutor:
+    """Create the shared matching pool on first use (spawned, so no threads are forked)."""
+    global _match_pool
+    with _match_pool_lock:
+        if _match_pool is None:
+            _match_pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count(),
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _match_pool
+
+
+def close_match_pool() -> None:
+    """Stop the matching worker processes (called on application shutdown)."""
+    global _match_pool
+    with _match_pool_lock:
+        if _match_pool is not None:
+            _match_pool.shutdown(cancel_futures=True)
+            _match_pool = None
+
+
+@lru_cache(maxsize=8)
+def _worker_matcher(terms: Tuple[str, ...]):
+    return CVEMatcher._build_matcher(list(terms))
+
+
+def _match_texts(terms: Tuple[str, ...], texts: Sequence[str]) -> List[int]:
+    """Worker-process entry point: offsets of the texts that mention any term."""
+    automaton, term_pattern = _worker_matcher(terms)
+    return [
+        offset for offset, text in enumerate(texts)
+        if CVEMatcher._matches_technology(text, term_pattern, automaton)
+    ]
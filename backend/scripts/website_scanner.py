@@ -9,16 +9,67 @@ from typing import Dict, List, Optional, Set
 from dataclasses import dataclass
 from urllib.parse import urlparse
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
 
 # Try to import BeautifulSoup, fallback to basic parsing if not available
 try:
-    from bs4 import BeautifulSoup
+    from bs4 import BeautifulSoup, SoupStrainer
     BS4_AVAILABLE = True
 except ImportError:
     BS4_AVAILABLE = False
     logger.warning("BeautifulSoup4 not available. HTML parsing will be limited.")
 
-logger = logging.getLogger(__name__)
+# lxml is a much faster tree builder than the stdlib html.parser
+try:
+    import lxml  # noqa: F401
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# Version patterns like 1.2.3, 1.2, v1.2.3 in free text and URL paths
+_VERSION_RE = re.compile(r'v?(\d+\.\d+(?:\.\d+)?)')
+_URL_VERSION_RE = re.compile(r'[/-]v?(\d+\.\d+(?:\.\d+)?)')
+
+# Every marker the basic HTML detector looks for, found in a single scan. The
+# script src is captured in a lookahead so library names inside the tag are
+# still matched by the other alternatives.
+_HTML_MARKERS_RE = re.compile(
+    r'(?P<wordpress>(?-i:wp-content|wp-includes))'
+    r'|(?P<django>(?-i:csrfmiddlewaretoken|Django))'
+    r'|(?P<jquery>jquery[.-]?(?P<jquery_version>\d+\.\d+(?:\.\d+)?))'
+    r'|(?P<react>react)'
+    r'|(?P<script><script(?=[^>]+src=["\'](?P<src>[^"\']+)["\']))',
+    re.IGNORECASE
+)
+
+# Common server patterns
+_SERVER_PATTERNS = [
+    (re.compile(r'nginx/([\d.]+)', re.IGNORECASE), 'Nginx'),
+    (re.compile(r'Apache/([\d.]+)', re.IGNORECASE), 'Apache'),
+    (re.compile(r'Microsoft-IIS/([\d.]+)', re.IGNORECASE), 'IIS'),
+    (re.compile(r'Caddy/([\d.]+)', re.IGNORECASE), 'Caddy'),
+    (re.compile(r'Cloudflare', re.IGNORECASE), 'Cloudflare'),
+]
+
+# Mounted on every scanner's session so repeat scans of a host reuse its
+# keep-alive connection (and TLS session) instead of handshaking again.
+# Connection failures and gateway errors get a quick retry; slow reads do not.
+_ADAPTER = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(total=2, connect=1, read=0, backoff_factor=0.3,
+                      status_forcelist=[502, 503, 504], raise_on_status=False)
+)
+
+# Libraries recognised in script URLs served from common CDN hosts
+_CDN_LIBS = {
+    'cdnjs.cloudflare.com': ('jquery', 'bootstrap', 'react', 'vue', 'angular'),
+    'cdn.jsdelivr.net': ('jquery', 'bootstrap', 'react', 'vue'),
+    'unpkg.com': ('react', 'vue', 'angular'),
+}
 
 
 @dataclass
@@ -37,6 +88,8 @@ class WebsiteScanner:
         self.timeout = timeout
         self.max_redirects = max_redirects
         self.session = requests.Session()
+        self.session.mount('https://', _ADAPTER)
+        self.session.mount('http://', _ADAPTER)
         self.session.max_redirects = max_redirects
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
@@ -95,13 +148,16 @@ class WebsiteScanner:
         """Detect technologies from HTTP headers."""
         detected = []
         
+        # Each header is read once; response headers are case-insensitive
+        server = headers.get('Server')
+        powered_by = headers.get('X-Powered-By')
+        django_version = headers.get('X-Django-Version')
+        
         # Server detection
-        server = headers.get('Server', '')
         if server:
             detected.extend(self._parse_server_header(server))
         
         # X-Powered-By header
-        powered_by = headers.get('X-Powered-By', '')
         if powered_by:
             detected.append(DetectedTechnology(
                 name=powered_by.split('/')[0].strip(),
@@ -111,16 +167,16 @@ class WebsiteScanner:
             ))
         
         # Framework detection from headers
-        if 'X-Django-Version' in headers:
+        if django_version is not None:
             detected.append(DetectedTechnology(
                 name="Django",
-                version=headers['X-Django-Version'],
+                version=django_version,
                 confidence="high",
                 source="header"
             ))
         
         # Cloudflare detection
-        if 'CF-Ray' in headers or 'cf-ray' in headers:
+        if 'CF-Ray' in headers:
             detected.append(DetectedTechnology(
                 name="Cloudflare",
                 confidence="high",
@@ -128,7 +184,7 @@ class WebsiteScanner:
             ))
         
         # WordPress detection
-        if 'X-Powered-By' in headers and 'WordPress' in headers.get('X-Powered-By', ''):
+        if powered_by and 'WordPress' in powered_by:
             detected.append(DetectedTechnology(
                 name="WordPress",
                 confidence="medium",
@@ -146,7 +202,12 @@ class WebsiteScanner:
             return self._detect_from_html_basic(html, base_url)
         
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            # Only <meta> and <script> tags are inspected, so skip building the rest of the tree
+            soup = BeautifulSoup(
+                html,
+                'lxml' if LXML_AVAILABLE else 'html.parser',
+                parse_only=SoupStrainer(['meta', 'script'])
+            )
             
             # Meta generator tag
             generator = soup.find('meta', attrs={'name': 'generator'})
@@ -224,8 +285,17 @@ class WebsiteScanner:
         """Basic HTML detection using regex when BeautifulSoup is not available."""
         detected = []
         
+        # Single pass: keep the first hit per marker and every script src
+        markers = {}
+        script_srcs = []
+        for match in _HTML_MARKERS_RE.finditer(html):
+            if match.lastgroup == 'script':
+                script_srcs.append(match.group('src'))
+            elif match.lastgroup not in markers:
+                markers[match.lastgroup] = match
+        
         # WordPress detection
-        if 'wp-content' in html or 'wp-includes' in html:
+        if 'wordpress' in markers:
             detected.append(DetectedTechnology(
                 name="WordPress",
                 confidence="high",
@@ -233,7 +303,7 @@ class WebsiteScanner:
             ))
         
         # Django detection
-        if 'csrfmiddlewaretoken' in html or 'Django' in html:
+        if 'django' in markers:
             detected.append(DetectedTechnology(
                 name="Django",
                 confidence="medium",
@@ -241,17 +311,16 @@ class WebsiteScanner:
             ))
         
         # JavaScript library detection from script tags (basic regex)
-        jquery_match = re.search(r'jquery[.-]?(\d+\.\d+(?:\.\d+)?)', html, re.IGNORECASE)
-        if jquery_match:
+        if 'jquery' in markers:
             detected.append(DetectedTechnology(
                 name="jQuery",
-                version=jquery_match.group(1) if jquery_match.groups() else None,
+                version=markers['jquery'].group('jquery_version'),
                 confidence="medium",
                 source="script"
             ))
         
         # React detection
-        if 'react' in html.lower() or 'reactjs' in html.lower():
+        if 'react' in markers:
             detected.append(DetectedTechnology(
                 name="React",
                 confidence="medium",
@@ -259,53 +328,35 @@ class WebsiteScanner:
             ))
         
         # CDN detection from script tags
-        script_pattern = r'<script[^>]+src=["\']([^"\']+)["\']'
-        for match in re.finditer(script_pattern, html, re.IGNORECASE):
-            src = match.group(1)
+        for src in script_srcs:
             detected.extend(self._detect_from_cdn(src))
         
         return detected
     
     def _detect_from_cdn(self, url: str) -> List[DetectedTechnology]:
         """Detect technologies from CDN URLs."""
-        detected = []
-        
-        # Common CDN patterns
-        cdn_patterns = {
-            'cdnjs.cloudflare.com': ['jquery', 'bootstrap', 'react', 'vue', 'angular'],
-            'cdn.jsdelivr.net': ['jquery', 'bootstrap', 'react', 'vue'],
-            'unpkg.com': ['react', 'vue', 'angular'],
-        }
-        
-        for cdn, libs in cdn_patterns.items():
-            if cdn in url:
-                for lib in libs:
-                    if lib in url.lower():
-                        version = self._extract_version_from_url(url)
-                        detected.append(DetectedTechnology(
-                            name=lib.capitalize(),
-                            version=version,
-                            confidence="medium",
-                            source="cdn"
-                        ))
+        libs = _CDN_LIBS.get(urlparse(url).netloc.lower())
+        if not libs:
+            return []
         
-        return detected
+        url_lower = url.lower()
+        version = self._extract_version_from_url(url)
+        return [
+            DetectedTechnology(
+                name=lib.capitalize(),
+                version=version,
+                confidence="medium",
+                source="cdn"
+            )
+            for lib in libs if lib in url_lower
+        ]
     
     def _parse_server_header(self, server: str) -> List[DetectedTechnology]:
         """Parse Server header to extract server and version."""
         detected = []
         
-        # Common server patterns
-        patterns = [
-            (r'nginx/([\d.]+)', 'Nginx'),
-            (r'Apache/([\d.]+)', 'Apache'),
-            (r'Microsoft-IIS/([\d.]+)', 'IIS'),
-            (r'Caddy/([\d.]+)', 'Caddy'),
-            (r'Cloudflare', 'Cloudflare'),
-        ]
-        
-        for pattern, name in patterns:
-            match = re.search(pattern, server, re.IGNORECASE)
+        for pattern, name in _SERVER_PATTERNS:
+            match = pattern.search(server)
             if match:
                 version = match.group(1) if match.groups() else None
                 detected.append(DetectedTechnology(
@@ -320,14 +371,12 @@ class WebsiteScanner:
     
     def _extract_version(self, text: str) -> Optional[str]:
         """Extract version number from text."""
-        # Match version patterns like 1.2.3, 1.2, v1.2.3
-        match = re.search(r'v?(\d+\.\d+(?:\.\d+)?)', text)
+        match = _VERSION_RE.search(text)
         return match.group(1) if match else None
     
     def _extract_version_from_url(self, url: str) -> Optional[str]:
         """Extract version from URL path."""
-        # Match patterns like /1.2.3/, /v1.2.3/, /1.2/
-        match = re.search(r'[/-]v?(\d+\.\d+(?:\.\d+)?)', url)
+        match = _URL_VERSION_RE.search(url)
         return match.group(1) if match else None
     
     def _organize_technologies(self, technologies: List[DetectedTechnology]) -> Dict[str, List[Dict]]:
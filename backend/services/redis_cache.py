@@ -3,10 +3,13 @@
 import logging
 import json
 import hashlib
-from typing import Optional, Any, Callable
-from functools import wraps
+import inspect
+from typing import Optional, Any, Callable, List, Tuple
+from functools import lru_cache, wraps
 import asyncio
 import os
+import time
+from collections import OrderedDict
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +22,170 @@ try:
 except ImportError:
     logger.warning("Redis not installed. Install with: pip install redis hiredis")
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+# SCAN COUNT hint and number of keys per DEL when invalidating by pattern
+SCAN_COUNT = 1024
+DELETE_BATCH_SIZE = 500
+
+# Connection pools are shared by every RedisCache in the process, one per URL
+REDIS_MAX_CONNECTIONS = 32
+REDIS_SOCKET_TIMEOUT = 1.0
+# Seconds between reconnect attempts after Redis stops answering
+RECONNECT_INTERVAL = 5.0
+_pools: dict = {}
+
+# In-process L1 cache in front of Redis. Hits skip Redis entirely. An entry
+# lives for the key's remaining Redis TTL, capped at L1_CACHE_TTL seconds, so
+# another worker's delete can take up to that long to show.
+# Generation counters are held for at most GENERATION_L1_TTL seconds; a bump
+# in this process clears L1, so it takes effect here immediately.
+L1_CACHE_SIZE = 1024
+L1_CACHE_TTL = float(os.getenv("CACHE_L1_TTL", "30"))
+GENERATION_L1_TTL = float(os.getenv("CACHE_GEN_L1_TTL", "1"))
+
+# Seconds a get_stats() result is reused before asking Redis again
+STATS_CACHE_TTL = 2.0
+
+# Namespaces cached through cache_response are invalidated by bumping a
+# generation counter stored under gen:<namespace> instead of deleting keys
+GENERATION_KEY_PREFIX = "gen:"
+_generational_namespaces: set = set()
+
+# One-byte format tags in front of stored values; untagged values are JSON
+_MSGPACK_TAG = b"M"
+_BYTES_TAG = b"B"
+_STR_TAG = b"S"
+
+
+def _msgpack_default(obj: Any) -> Any:
+    # numpy arrays and scalars expose tolist(); anything else is stored as str
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    return str(obj)
+
+
+def _dumps(value: Any) -> bytes:
+    # Strings and bytes (e.g. pre-rendered JSON) are stored as-is
+    if isinstance(value, (bytes, bytearray)):
+        return _BYTES_TAG + value
+    if isinstance(value, str):
+        return _STR_TAG + value.encode()
+    if MSGPACK_AVAILABLE:
+        return _MSGPACK_TAG + msgpack.packb(value, use_bin_type=True, default=_msgpack_default)
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            value,
+            default=str,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(value, default=str).encode()
+
+
+def _loads(data: bytes) -> Any:
+    tag = data[:1]
+    if tag == _MSGPACK_TAG:
+        return msgpack.unpackb(data[1:], raw=False, strict_map_key=False)
+    if tag == _BYTES_TAG:
+        return data[1:]
+    if tag == _STR_TAG:
+        return data[1:].decode()
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@lru_cache(maxsize=4096)
+def _hash_key(key_data: str) -> str:
+    # Hot endpoints hash the same argument strings over and over. Keys only
+    # need to be well spread, not collision-resistant, so skip SHA-256.
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_64_hexdigest(key_data.encode())
+    return hashlib.blake2b(key_data.encode(), digest_size=8).hexdigest()
+
+
+def _get_pool(url: str) -> "redis.ConnectionPool":
+    """Return the process-wide connection pool for a Redis URL."""
+    pool = _pools.get(url)
+    if pool is None:
+        pool = redis.ConnectionPool.from_url(
+            url,
+            decode_responses=False,  # Values are serialized bytes
+            max_connections=REDIS_MAX_CONNECTIONS,
+            socket_keepalive=True,
+            socket_connect_timeout=5,
+            socket_timeout=REDIS_SOCKET_TIMEOUT,  # A hung server fails fast instead of stalling requests
+            health_check_interval=30
+        )
+        _pools[url] = pool
+    return pool
+
+
+def _remaining_ttl(pttl: Optional[int]) -> Optional[float]:
+    """Seconds left from a PTTL reply; None for a key without expiry."""
+    if pttl is None or pttl == -1:
+        return None
+    return max(pttl, 0) / 1000
+
+
+class _LocalCache:
+    """Small LRU with per-entry expiry, holding serialized values.
+    
+    RedisCache decodes an entry on every hit, so callers each get their own
+    objects and can mutate them without affecting later reads. Entries live
+    for the TTL they are put with, capped at ``ttl`` (``generation_ttl`` for
+    generation counters).
+    """
+    
+    def __init__(self, maxsize: int, ttl: float, generation_ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.generation_ttl = generation_ttl
+        self._entries: OrderedDict = OrderedDict()
+    
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+    
+    def put(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        limit = self.generation_ttl if key.startswith(GENERATION_KEY_PREFIX) else self.ttl
+        ttl = limit if ttl is None else min(ttl, limit)
+        if value is None or ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+    
+    def pop(self, key: str) -> None:
+        self._entries.pop(key, None)
+    
+    def clear(self) -> None:
+        self._entries.clear()
+
 
 class RedisCache:
     """Redis cache manager with connection pooling."""
@@ -27,7 +194,16 @@ class RedisCache:
         self.url = url or os.getenv("REDIS_URL", "redis://localhost:6379/0")
         self.enabled = enabled and REDIS_AVAILABLE
         self.client: Optional[redis.Redis] = None
+        # Only ever True while enabled, so hot paths can check this one flag
         self._connected = False
+        self._local = _LocalCache(L1_CACHE_SIZE, L1_CACHE_TTL, GENERATION_L1_TTL)
+        self._use_unlink = True
+        # SCAN ... TYPE needs Redis 6.0; cleared the first time a server rejects it
+        self._use_scan_type = True
+        # cache_response keys currently being computed, for request coalescing
+        self._inflight: dict = {}
+        self._stats_cache: Optional[Tuple[float, dict]] = None
+        self._reconnect_task: Optional[asyncio.Task] = None
         
     async def connect(self) -> bool:
         if not self.enabled:
@@ -35,15 +211,7 @@ class RedisCache:
             return False
         
         try:
-            self.client = await redis.from_url(
-                self.url,
-                encoding="utf-8",
-                decode_responses=True,
-                max_connections=10,  # Connection pool size
-                socket_keepalive=True,
-                socket_connect_timeout=5,
-                retry_on_timeout=True
-            )
+            self.client = redis.Redis(connection_pool=_get_pool(self.url))
             
             # Test connection
             await self.client.ping()
@@ -58,93 +226,273 @@ class RedisCache:
             return False
     
     async def disconnect(self):
+        if self._reconnect_task:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
         if self.client:
             await self.client.close()
+            # The pool is shared, so only drop connections nobody is using
+            await self.client.connection_pool.disconnect(inuse_connections=False)
             self._connected = False
             logger.info("Redis connection closed")
     
     def is_connected(self) -> bool:
-        return self._connected and self.enabled
+        return self._connected
+    
+    def _on_error(self, error: Exception) -> None:
+        """Pause caching when Redis stops answering and reconnect in the background."""
+        if not isinstance(error, (asyncio.TimeoutError, redis.ConnectionError, redis.TimeoutError)):
+            return
+        if not self._connected:
+            return
+        self._connected = False
+        logger.warning(f"Redis unreachable ({error}). Caching paused until it reconnects.")
+        self._reconnect_task = asyncio.create_task(self._reconnect())
+    
+    async def _reconnect(self):
+        while True:
+            await asyncio.sleep(RECONNECT_INTERVAL)
+            try:
+                await self.client.ping()
+            except Exception as e:
+                logger.debug(f"Redis reconnect attempt failed: {e}")
+                continue
+            # Anything held locally may have been invalidated while we were away
+            self._local.clear()
+            self._connected = True
+            self._reconnect_task = None
+            logger.info(f"Redis reconnected to {self.url}")
+            return
     
     async def get(self, key: str) -> Optional[Any]:
-        if not self.is_connected():
+        if not self._connected:
             return None
         
+        local_value = self._local.get(key)
+        if local_value is not None:
+            return _loads(local_value)
+        
         try:
-            value = await self.client.get(key)
+            # PTTL rides along so the L1 copy never outlives the Redis key
+            pipe = self.client.pipeline(transaction=False)
+            pipe.get(key)
+            pipe.pttl(key)
+            value, pttl = await pipe.execute()
             if value:
                 logger.debug(f"Cache HIT: {key}")
-                return json.loads(value)
+                self._local.put(key, value, _remaining_ttl(pttl))
+                return _loads(value)
             logger.debug(f"Cache MISS: {key}")
             return None
         except Exception as e:
             logger.warning(f"Cache GET error for key '{key}': {e}")
+            self._on_error(e)
             return None
     
     async def set(self, key: str, value: Any, ttl: int = 300) -> bool:
-        if not self.is_connected():
+        if not self._connected:
             return False
         
         try:
-            serialized = json.dumps(value, default=str)
+            serialized = _dumps(value)
             await self.client.setex(key, ttl, serialized)
+            self._local.put(key, serialized, ttl)
             logger.debug(f"Cache SET: {key} (TTL: {ttl}s)")
             return True
         except Exception as e:
             logger.warning(f"Cache SET error for key '{key}': {e}")
+            self._on_error(e)
             return False
     
+    async def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        """Fetch several values in a single MGET; missing keys come back as None."""
+        if not self._connected:
+            return [None] * len(keys)
+        
+        results = [self._local.get(key) for key in keys]
+        missing = [i for i, value in enumerate(results) if value is None]
+        results = [None if value is None else _loads(value) for value in results]
+        if not missing:
+            return results
+        
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.mget([keys[i] for i in missing])
+            for i in missing:
+                pipe.pttl(keys[i])
+            values, *pttls = await pipe.execute()
+            for i, value, pttl in zip(missing, values, pttls):
+                if value:
+                    self._local.put(keys[i], value, _remaining_ttl(pttl))
+                    results[i] = _loads(value)
+            return results
+        except Exception as e:
+            logger.warning(f"Cache MGET error for keys {keys}: {e}")
+            self._on_error(e)
+            return [None] * len(keys)
+    
+    async def mset(self, mapping: dict, ttl: int = 300) -> bool:
+        """
+        Store several values with one pipelined round-trip.
+        
+        Endpoints that resolve many sub-results can pair this with mget():
+        fetch all keys at once, compute only the misses, then mset them.
+        """
+        if not mapping or not self._connected:
+            return False
+        
+        try:
+            serialized = {key: _dumps(value) for key, value in mapping.items()}
+            pipe = self.client.pipeline(transaction=False)
+            for key, value in serialized.items():
+                pipe.setex(key, ttl, value)
+            await pipe.execute()
+            for key, value in serialized.items():
+                self._local.put(key, value, ttl)
+            logger.debug(f"Cache MSET: {len(mapping)} keys (TTL: {ttl}s)")
+            return True
+        except Exception as e:
+            logger.warning(f"Cache MSET error for keys {list(mapping)}: {e}")
+            self._on_error(e)
+            return False
+    
+    async def init_generation(self, namespace: str) -> None:
+        """Create gen:<namespace> at 0 if it is absent, so hits can hold it in L1."""
+        if not self._connected:
+            return
+        
+        try:
+            await self.client.set(f"{GENERATION_KEY_PREFIX}{namespace}", 0, nx=True)
+        except Exception as e:
+            logger.warning(f"Cache SETNX error for namespace '{namespace}': {e}")
+            self._on_error(e)
+    
+    async def bump_generation(self, namespace: str) -> int:
+        """Invalidate every versioned entry in a namespace with a single INCR."""
+        if not self._connected:
+            return 0
+        
+        try:
+            generation = await self.client.incr(f"{GENERATION_KEY_PREFIX}{namespace}")
+            self._local.clear()
+            logger.info(f"Cache INVALIDATE: Namespace '{namespace}' moved to generation {generation}")
+            return generation
+        except Exception as e:
+            logger.warning(f"Cache INCR error for namespace '{namespace}': {e}")
+            self._on_error(e)
+            return 0
+    
+    async def bump_generations(self, namespaces: List[str]) -> None:
+        """Bump several namespace generations with one pipelined round-trip."""
+        if not namespaces or not self._connected:
+            return
+        
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for namespace in namespaces:
+                pipe.incr(f"{GENERATION_KEY_PREFIX}{namespace}")
+            await pipe.execute()
+            self._local.clear()
+            logger.info(f"Cache INVALIDATE: Bumped generations for {', '.join(namespaces)}")
+        except Exception as e:
+            logger.warning(f"Cache INCR error for namespaces {namespaces}: {e}")
+            self._on_error(e)
+    
     async def delete(self, key: str) -> bool:
-        if not self.is_connected():
+        if not self._connected:
             return False
         
         try:
             await self.client.delete(key)
+            self._local.pop(key)
             logger.debug(f"Cache DELETE: {key}")
             return True
         except Exception as e:
             logger.warning(f"Cache DELETE error for key '{key}': {e}")
+            self._on_error(e)
             return False
     
-    async def delete_pattern(self, pattern: str) -> int:
-        if not self.is_connected():
+    async def delete_pattern(self, pattern: str, count: int = SCAN_COUNT,
+                             type_hint: Optional[str] = None) -> int:
+        if not self._connected:
             return 0
         
         try:
-            keys = []
-            async for key in self.client.scan_iter(match=pattern):
-                keys.append(key)
+            deleted = 0
+            batch = []
+            # UNLINK frees values in a Redis background thread instead of
+            # blocking the server the way DEL does
+            remove = self.client.unlink if self._use_unlink else self.client.delete
+            # A large COUNT hint keeps the number of SCAN round-trips low; keys
+            # are removed in fixed-size batches as they stream in, so neither
+            # memory nor any single command grows with the number of matches
+            scan_type = type_hint if self._use_scan_type else None
+            async for key in self.client.scan_iter(match=pattern, count=count, _type=scan_type):
+                batch.append(key)
+                if len(batch) >= DELETE_BATCH_SIZE:
+                    deleted += await remove(*batch)
+                    batch.clear()
+            if batch:
+                deleted += await remove(*batch)
+            self._local.clear()
             
-            if keys:
-                deleted = await self.client.delete(*keys)
+            if deleted:
                 logger.info(f"Cache INVALIDATE: Deleted {deleted} keys matching '{pattern}'")
-                return deleted
+            return deleted
+        except redis.ResponseError as e:
+            if self._use_unlink and "unknown command" in str(e).lower():
+                # Redis older than 4.0 has no UNLINK; retry the pattern with DEL
+                self._use_unlink = False
+                return await self.delete_pattern(pattern, count=count, type_hint=type_hint)
+            if type_hint and self._use_scan_type:
+                # Redis older than 6.0 rejects SCAN's TYPE option; scan untyped
+                self._use_scan_type = False
+                return await self.delete_pattern(pattern, count=count, type_hint=type_hint)
+            logger.warning(f"Cache DELETE_PATTERN error for pattern '{pattern}': {e}")
             return 0
         except Exception as e:
             logger.warning(f"Cache DELETE_PATTERN error for pattern '{pattern}': {e}")
+            self._on_error(e)
             return 0
     
+    async def delete_patterns(self, patterns: List[str], count: int = SCAN_COUNT,
+                              type_hint: Optional[str] = None) -> int:
+        """Run delete_pattern for several patterns concurrently."""
+        if not patterns:
+            return 0
+        deleted = await asyncio.gather(
+            *(self.delete_pattern(p, count=count, type_hint=type_hint) for p in patterns)
+        )
+        return sum(deleted)
+    
     async def clear_all(self) -> bool:
-        if not self.is_connected():
+        if not self._connected:
             return False
         
         try:
             await self.client.flushdb()
+            self._local.clear()
             logger.warning("Cache CLEAR: All cache entries cleared")
             return True
         except Exception as e:
             logger.error(f"Cache CLEAR error: {e}")
+            self._on_error(e)
             return False
     
     async def get_stats(self) -> dict:
-        if not self.is_connected():
+        if not self._connected:
             return {"status": "disconnected", "enabled": False}
         
+        # INFO walks server internals; the numbers barely move within a few seconds
+        now = time.monotonic()
+        if self._stats_cache is not None and now - self._stats_cache[0] < STATS_CACHE_TTL:
+            return self._stats_cache[1]
+        
         try:
             info = await self.client.info("stats")
             dbsize = await self.client.dbsize()
             
-            return {
+            stats = {
                 "status": "connected",
                 "enabled": True,
                 "total_keys": dbsize,
@@ -155,8 +503,11 @@ class RedisCache:
                     info.get("keyspace_misses", 0)
                 )
             }
+            self._stats_cache = (now, stats)
+            return stats
         except Exception as e:
             logger.warning(f"Cache STATS error: {e}")
+            self._on_error(e)
             return {"status": "error", "error": str(e)}
     
     def _calculate_hit_rate(self, hits: int, misses: int) -> float:
@@ -166,12 +517,41 @@ class RedisCache:
         return round((hits / total) * 100, 2)
     
     def generate_cache_key(self, *args, **kwargs) -> str:
-        key_data = f"{args}:{sorted(kwargs.items())}"
-        return hashlib.sha256(key_data.encode()).hexdigest()[:16]
+        return _hash_key(f"{args}:{sorted(kwargs.items())}")
 
 
 cache = RedisCache()
 
+# Strong references to background cache writes until they finish
+_background_tasks: set = set()
+
+
+def _run_in_background(coro) -> None:
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+# Endpoint parameters that are FastAPI plumbing rather than query inputs
+_UNCACHED_PARAMS = frozenset({"request", "response", "background_tasks"})
+
+
+def _key_builder(func: Callable, prefix: str) -> Callable[[dict], str]:
+    """Resolve the cacheable parameter names of an endpoint once, at decoration time."""
+    names = tuple(
+        name for name in inspect.signature(func).parameters
+        if name not in _UNCACHED_PARAMS
+    )
+    
+    def build_key(kwargs: dict) -> str:
+        parts = [prefix]
+        for name in names:
+            if name in kwargs:
+                parts.append(f"{name}={kwargs[name]}")
+        return ":".join(parts)
+    
+    return build_key
+
 
 def cache_response(ttl: int = 300, key_prefix: str = ""):
     """
@@ -188,33 +568,67 @@ def cache_response(ttl: int = 300, key_prefix: str = ""):
             return {"data": "..."}
     """
     def decorator(func: Callable):
+        prefix = key_prefix or func.__name__
+        namespace = prefix.split(":", 1)[0]
+        generation_key = f"{GENERATION_KEY_PREFIX}{namespace}"
+        _generational_namespaces.add(namespace)
+        build_key = _key_builder(func, prefix)
+        
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            if not cache.is_connected():
+            if not cache._connected:
                 # Cache not available, call function directly
                 return await func(*args, **kwargs)
             
-            # Generate cache key
-            prefix = key_prefix or func.__name__
-            
-            # Extract query parameters for key generation
-            cache_key_parts = [prefix]
-            for key, value in kwargs.items():
-                if key not in ['request', 'response']:  # Exclude FastAPI objects
-                    cache_key_parts.append(f"{key}={value}")
+            cache_key = build_key(kwargs)
             
-            cache_key = ":".join(cache_key_parts)
+            # Fetch the namespace generation and the entry in one round-trip,
+            # or none when both are held in L1; entries from an older
+            # generation are stale
+            generation, cached_value = await cache.mget([generation_key, cache_key])
+            if generation is None:
+                # A never-bumped namespace is at generation 0; store the counter
+                # so later hits can serve it from L1
+                generation = 0
+                _run_in_background(cache.init_generation(namespace))
+            if isinstance(cached_value, dict) and cached_value.get("_gen") == generation:
+                return cached_value["_data"]
             
-            # Try to get from cache
-            cached_value = await cache.get(cache_key)
-            if cached_value is not None:
-                return cached_value
+            # Cache miss - if another request is already computing this key,
+            # wait for its result instead of computing it again
+            inflight = cache._inflight.get(cache_key)
+            if inflight is not None:
+                try:
+                    return await asyncio.shield(inflight)
+                except asyncio.CancelledError:
+                    if not inflight.cancelled():
+                        raise  # This request itself was cancelled
+                    # The leading request was cancelled; start over so one
+                    # of the waiters takes over the computation
+                    return await wrapper(*args, **kwargs)
+                except Exception:
+                    # The leading request failed; compute independently
+                    # rather than sharing its error
+                    return await func(*args, **kwargs)
             
-            # Cache miss - compute value
-            result = await func(*args, **kwargs)
+            future = asyncio.get_running_loop().create_future()
+            cache._inflight[cache_key] = future
+            try:
+                result = await func(*args, **kwargs)
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as e:
+                future.set_exception(e)
+                future.exception()  # Retrieved here so unawaited failures are not logged
+                raise
+            finally:
+                cache._inflight.pop(cache_key, None)
+            future.set_result(result)
             
-            # Store in cache
-            await cache.set(cache_key, result, ttl=ttl)
+            # Store in cache, tagged with the generation it was computed under.
+            # The write runs in the background so the response does not wait on it.
+            _run_in_background(cache.set(cache_key, {"_gen": generation, "_data": result}, ttl=ttl))
             
             return result
         
@@ -222,18 +636,35 @@ def cache_response(ttl: int = 300, key_prefix: str = ""):
     return decorator
 
 
-async def invalidate_cache_on_update(patterns: list):
+async def invalidate_cache_on_update(patterns: list, count: int = SCAN_COUNT):
     """
     Invalidate cache entries matching patterns.
     
+    Patterns of the form "<namespace>:*" (or a bare namespace) that cover a
+    cache_response namespace bump its generation in O(1); any other pattern
+    falls back to a SCAN-based delete.
+    
     Args:
         patterns: List of Redis key patterns to invalidate
+        count: SCAN COUNT hint used while matching keys
         
     Usage:
         await invalidate_cache_on_update(["stats:*", "threats:*"])
     """
-    if not cache.is_connected():
+    if not cache._connected:
         return
     
+    namespaces = []
+    scan_patterns = []
     for pattern in patterns:
-        await cache.delete_pattern(pattern)
+        namespace = pattern[:-2] if pattern.endswith(":*") else pattern
+        if namespace in _generational_namespaces:
+            namespaces.append(namespace)
+        else:
+            scan_patterns.append(pattern)
+    
+    await asyncio.gather(
+        cache.bump_generations(namespaces),
+        # Everything this module stores is a plain string value
+        cache.delete_patterns(scan_patterns, count=count, type_hint="string")
+    )
@@ -11,8 +11,24 @@ import os
 # Add backend to path
 sys.path.insert(0, os.path.dirname(__file__))
 
+from services import redis_cache
 from services.redis_cache import RedisCache
 
+try:
+    import fakeredis
+    FAKEREDIS_AVAILABLE = True
+except ImportError:
+    FAKEREDIS_AVAILABLE = False
+
+
+def _fake_cache() -> RedisCache:
+    """A RedisCache backed by an in-memory fakeredis server, installed as the module cache."""
+    fake = RedisCache()
+    fake.client = fakeredis.FakeAsyncRedis(decode_responses=False)
+    fake._connected = True
+    redis_cache.cache = fake
+    return fake
+
 
 async def test_redis_connection():
     """Test basic Redis connection."""
@@ -100,10 +116,168 @@ async def test_redis_connection():
     return True
 
 
+async def test_generational_invalidation():
+    """Bumping gen:<namespace> must make cache_response miss."""
+    print("\nTesting generational invalidation...")
+    cache = _fake_cache()
+    calls = []
+    
+    @redis_cache.cache_response(ttl=60, key_prefix="stats")
+    async def endpoint(page: int = 1):
+        calls.append(page)
+        return {"page": page, "computed": len(calls)}
+    
+    first = await endpoint(page=1)
+    await asyncio.sleep(0.01)  # Let the background cache write land
+    second = await endpoint(page=1)
+    if len(calls) != 1 or second != first:
+        print(f"   [FAIL] Expected a cache hit, function ran {len(calls)} times")
+        return False
+    
+    await cache.bump_generation("stats")
+    third = await endpoint(page=1)
+    if len(calls) != 2 or third["computed"] != 2:
+        print("   [FAIL] Cached entry survived a generation bump")
+        return False
+    
+    await asyncio.sleep(0.01)
+    await redis_cache.invalidate_cache_on_update(["stats:*"])
+    await endpoint(page=1)
+    if len(calls) != 3:
+        print("   [FAIL] invalidate_cache_on_update did not invalidate the namespace")
+        return False
+    
+    print("   [PASS] Generation bump invalidates cached responses")
+    return True
+
+
+async def test_request_coalescing():
+    """Concurrent misses for the same key must call the function once."""
+    print("\nTesting request coalescing...")
+    _fake_cache()
+    calls = []
+    
+    @redis_cache.cache_response(ttl=60, key_prefix="charts:trend")
+    async def endpoint(days: int = 7):
+        calls.append(days)
+        await asyncio.sleep(0.05)
+        return {"days": days}
+    
+    results = await asyncio.gather(*(endpoint(days=7) for _ in range(10)))
+    if len(calls) != 1:
+        print(f"   [FAIL] Expected 1 call for 10 concurrent misses, got {len(calls)}")
+        return False
+    if any(result != {"days": 7} for result in results):
+        print(f"   [FAIL] Waiters got unexpected results: {results}")
+        return False
+    
+    # A cancelled leader must not cancel the requests waiting on it
+    calls.clear()
+    leader = asyncio.create_task(endpoint(days=30))
+    await asyncio.sleep(0.01)
+    waiters = [asyncio.create_task(endpoint(days=30)) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    leader.cancel()
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+    if any(result != {"days": 30} for result in results):
+        print(f"   [FAIL] Waiters did not recover from a cancelled leader: {results}")
+        return False
+    if len(calls) != 2:
+        print(f"   [FAIL] Expected the work to be redone once, got {len(calls)} calls")
+        return False
+    
+    print("   [PASS] Concurrent misses are coalesced")
+    return True
+
+
+async def test_local_cache_isolation():
+    """L1 hits must not hand out shared mutable objects."""
+    print("\nTesting L1 cache isolation...")
+    cache = _fake_cache()
+    await cache.set("test:l1:key", {"items": [1, 2, 3]}, ttl=60)
+    
+    first = await cache.get("test:l1:key")   # Redis hit, fills L1
+    first["items"].append(4)
+    second = await cache.get("test:l1:key")  # L1 hit
+    second["extra"] = True
+    third = await cache.get("test:l1:key")
+    
+    if third != {"items": [1, 2, 3]}:
+        print(f"   [FAIL] Mutating a returned value changed the cache: {third}")
+        return False
+    if second is third:
+        print("   [FAIL] L1 returned the same object twice")
+        return False
+    
+    print("   [PASS] L1 hits are independent copies")
+    return True
+
+
+async def test_local_cache_expiry():
+    """L1 entries must not outlive the Redis key, and hot hits must skip Redis."""
+    print("\nTesting L1 cache expiry...")
+    cache = _fake_cache()
+    await cache.set("test:l1:short", {"ttl": 1}, ttl=1)
+    await cache.get("test:l1:short")
+    await asyncio.sleep(1.1)
+    if await cache.get("test:l1:short") is not None:
+        print("   [FAIL] L1 served a key after Redis expired it")
+        return False
+    
+    @redis_cache.cache_response(ttl=60, key_prefix="stats")
+    async def endpoint(page: int = 1):
+        return {"page": page}
+    
+    await endpoint(page=1)
+    await asyncio.sleep(0.01)
+    await endpoint(page=1)  # Holds the generation counter in L1
+    
+    round_trips = 0
+    pipeline, mget = cache.client.pipeline, cache.client.mget
+    
+    def counted_pipeline(*args, **kwargs):
+        nonlocal round_trips
+        round_trips += 1
+        return pipeline(*args, **kwargs)
+    
+    async def counted_mget(*args, **kwargs):
+        nonlocal round_trips
+        round_trips += 1
+        return await mget(*args, **kwargs)
+    
+    cache.client.pipeline, cache.client.mget = counted_pipeline, counted_mget
+    await endpoint(page=1)
+    if round_trips:
+        print(f"   [FAIL] A hot cache_response hit made {round_trips} Redis calls")
+        return False
+    
+    print("   [PASS] L1 follows the Redis TTL and serves hot hits locally")
+    return True
+
+
+async def run_offline_tests():
+    """Tests that run against fakeredis and need no Redis server."""
+    if not FAKEREDIS_AVAILABLE:
+        print("\n[SKIP] fakeredis not installed; run: pip install fakeredis")
+        return True
+    
+    original = redis_cache.cache
+    try:
+        results = [
+            await test_generational_invalidation(),
+            await test_request_coalescing(),
+            await test_local_cache_isolation(),
+            await test_local_cache_expiry(),
+        ]
+    finally:
+        redis_cache.cache = original
+    return all(results)
+
+
 async def main():
     """Main test runner."""
     try:
-        success = await test_redis_connection()
+        success = await run_offline_tests() and await test_redis_connection()
         sys.exit(0 if success else 1)
     except Exception as e:
         print(f"\n[ERROR] Error during testing: {e}")
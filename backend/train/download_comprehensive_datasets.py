@@ -4,10 +4,17 @@ Comprehensive Cybersecurity Dataset Downloader
 Downloads multiple datasets from various public sources for ML training
 """
 
+import email.utils
+import gzip
 import json
 import os
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 import logging
@@ -15,78 +22,349 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+try:
+    import requests_cache
+    REQUESTS_CACHE_AVAILABLE = True
+except ImportError:
+    REQUESTS_CACHE_AVAILABLE = False
+
 # Base directory for storing datasets
 BASE_DIR = Path(__file__).parent / "comprehensive_data"
 BASE_DIR.mkdir(exist_ok=True)
 
+MITRE_ATTACK_URLS = {
+    'enterprise': 'https://raw.githubusercontent.com/mitre/cti/master/enterprise-attack/enterprise-attack.json',
+    'mobile': 'https://raw.githubusercontent.com/mitre/cti/master/mobile-attack/mobile-attack.json',
+    'ics': 'https://raw.githubusercontent.com/mitre/cti/master/ics-attack/ics-attack.json',
+    'pre-attack': 'https://raw.githubusercontent.com/mitre/cti/master/pre-attack/pre-attack.json'
+}
+
+# NVD asks for at least 6 seconds between requests
+NVD_REQUEST_INTERVAL = 6.0
+
+# Responses younger than this are served from the on-disk HTTP cache
+# (requests-cache only) without touching the network
+HTTP_CACHE_EXPIRE = timedelta(hours=6)
+
+# Multi-MB bodies kept out of the HTTP cache: requests-cache reads a body in
+# full before storing it, which would undo streaming. These are revalidated
+# through the ETag sidecars instead.
+UNCACHED_URL_PATTERNS = [
+    'raw.githubusercontent.com/mitre/cti/*',
+    'nvd.nist.gov/feeds/*',
+    'gitlab.com/exploit-database/*',
+    'data.phishtank.com/*',
+]
+
+# Order of the categories in the download summary
+SUMMARY_ORDER = [
+    'mitre_attack', 'cisa_kev', 'exploitdb', 'threat_intel', 'malware',
+    'apt_groups', 'cve_data', 'ioc_feeds', 'time_series'
+]
+
+_session = None
+
+
+def get_session():
+    """Return the process-wide HTTP session shared by every downloader."""
+    global _session
+    if _session is None:
+        if REQUESTS_CACHE_AVAILABLE:
+            # Persists the smaller feeds across runs; large downloads bypass
+            # it and rely on the ETag sidecars alone
+            _session = requests_cache.CachedSession(
+                str(BASE_DIR / 'http_cache'),
+                backend='sqlite',
+                expire_after=HTTP_CACHE_EXPIRE,
+                urls_expire_after={
+                    pattern: requests_cache.DO_NOT_CACHE for pattern in UNCACHED_URL_PATTERNS
+                },
+                cache_control=True,
+                allowable_codes=(200,)
+            )
+        else:
+            _session = requests.Session()
+        _session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36',
+            # gzip/deflate, plus br/zstd when their decoders are installed,
+            # so no server sends an encoding urllib3 can't undo
+            'Accept-Encoding': make_headers(accept_encoding=True)['accept-encoding']
+        })
+        # Keep connections to repeat hosts (GitHub raw, abuse.ch, blocklist.de)
+        # alive and retry transient failures without caller code
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504]
+            )
+        )
+        _session.mount('https://', adapter)
+        _session.mount('http://', adapter)
+    return _session
+
+
+def _loads(raw):
+    """Parse JSON from bytes, skipping the str decode when orjson is available"""
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
+
+def _dumps(obj):
+    """Serialize one record to compact JSON bytes"""
+    return orjson.dumps(obj) if ORJSON_AVAILABLE else json.dumps(obj, separators=(',', ':')).encode()
+
+
+def _write_json(filepath, data, indent=False):
+    """Write data as JSON; compact unless the file is meant for people to read"""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if indent else 0)
+        Path(filepath).write_bytes(orjson.dumps(data, option=option))
+    else:
+        with open(filepath, 'w') as f:
+            json.dump(data, f, indent=2 if indent else None, default=_to_builtin)
+
+
+def _to_builtin(obj):
+    # numpy arrays and scalars, for the stdlib json fallback
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _save_stream(response, filepath, json_prefix=None):
+    """Stream a response body to filepath and return its entry count.
+    
+    Text is counted by lines, tallied from the raw chunks so the body is never
+    decoded or split. With json_prefix, the count is the length of the array at
+    that ijson prefix instead, read back from the .part file before it replaces
+    filepath, so a body that isn't valid JSON never overwrites a good copy.
+    """
+    part_filepath = filepath.with_name(filepath.name + '.part')
+    newlines = 0
+    last_byte = b'\n'
+    with open(part_filepath, 'wb') as f:
+        for chunk in response.iter_content(1 << 16):
+            if chunk:
+                f.write(chunk)
+                newlines += chunk.count(b'\n')
+                last_byte = chunk[-1:]
+    if json_prefix:
+        count = _count_json_items(part_filepath, json_prefix)
+    else:
+        # A final line without a trailing newline still counts
+        count = newlines + (last_byte != b'\n')
+    os.replace(part_filepath, filepath)
+    return count
+
+
+def _count_lines(filepath):
+    """Line count of a saved text file, counted the same way as _save_stream"""
+    newlines = 0
+    last_byte = b'\n'
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            newlines += chunk.count(b'\n')
+            last_byte = chunk[-1:]
+    return newlines + (last_byte != b'\n')
+
+
+def _count_json_items(filepath, prefix):
+    """Count the elements of the array at an ijson prefix such as 'CVE_Items.item'.
+    
+    Streams the file when ijson is available so the document is never held in memory.
+    """
+    with open(filepath, 'rb') as f:
+        if IJSON_AVAILABLE:
+            return sum(1 for _ in ijson.items(f, prefix, use_float=True))
+        data = _loads(f.read())
+    for key in prefix.split('.')[:-1]:
+        data = data.get(key, [])
+    return len(data)
+
+
+def _count_feed_entries(filepath, list_key=None):
+    """Entries in a saved JSON feed: the length of a top-level array, or of the
+    array under list_key when the top level is an object; 1 for anything else.
+    """
+    try:
+        with open(filepath, 'rb') as f:
+            if IJSON_AVAILABLE:
+                _, event, _ = next(ijson.parse(f))
+                f.seek(0)
+                if event == 'start_array':
+                    return sum(1 for _ in ijson.items(f, 'item', use_float=True))
+                if event == 'start_map' and list_key:
+                    return sum(1 for _ in ijson.items(f, f'{list_key}.item', use_float=True))
+                return 1
+            data = _loads(f.read())
+    except Exception:
+        return 1
+    if isinstance(data, list):
+        return len(data)
+    if isinstance(data, dict) and list_key:
+        return len(data.get(list_key, []))
+    return 1
+
+
+class _StartLimiter:
+    """Keeps at least `interval` seconds between request starts across threads"""
+    
+    def __init__(self, interval):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+    
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            delay = max(0.0, self._next_start - now)
+            self._next_start = max(now, self._next_start) + self.interval
+        if delay:
+            time.sleep(delay)
+
+
+def _is_current(response, cache_path):
+    """True when cache_path already holds the body of this response.
+    
+    That is a 304, or a requests-cache hit (fresh or revalidated, both seen
+    as 200) for a file saved on an earlier run.
+    """
+    if response.status_code == 304:
+        return True
+    return getattr(response, 'from_cache', False) and cache_path.exists()
+
+
+def _validators_path(cache_path):
+    # Not a .json file, so loaders globbing *.json never pick it up
+    return cache_path.with_name(cache_path.name + '.etag')
+
+
 class DatasetDownloader:
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36'
-        })
+        self.session = get_session()
+    
+    def _conditional_get(self, url, cache_path, **kwargs):
+        """GET url, revalidating against the copy saved at cache_path.
+        
+        When _is_current(response, cache_path) holds, cache_path is still
+        current and should not be rewritten.
+        """
+        headers = {}
+        if not cache_path.exists():
+            return self.session.get(url, headers=headers, **kwargs)
+        sidecar = _validators_path(cache_path)
+        try:
+            validators = json.loads(sidecar.read_text())
+        except (OSError, ValueError):
+            validators = {}
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+        elif not headers:
+            # No saved validators (e.g. a copy from before the sidecars
+            # existed), so ask whether anything changed since it was written
+            headers['If-Modified-Since'] = email.utils.formatdate(
+                cache_path.stat().st_mtime, usegmt=True)
+        return self.session.get(url, headers=headers, **kwargs)
+    
+    def _save_validators(self, cache_path, response):
+        """Remember the ETag/Last-Modified of the response just saved to cache_path"""
+        validators = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified')
+        }
+        sidecar = _validators_path(cache_path)
+        if any(validators.values()):
+            sidecar.write_text(json.dumps(validators))
+        elif sidecar.exists():
+            sidecar.unlink()
+    
+    def _fetch_to_file(self, label, url, filepath, json_prefix=None, timeout=30):
+        """Conditionally download url to filepath and return its entry count.
+        
+        Entries are lines, or the items of the array at json_prefix. A 304 or
+        an HTTP cache hit recounts the copy already on disk. Returns None,
+        after logging, when the server answers with any other status.
+        """
+        with self._conditional_get(url, filepath, timeout=timeout, stream=True) as response:
+            if _is_current(response, filepath):
+                if json_prefix:
+                    return _count_json_items(filepath, json_prefix)
+                return _count_lines(filepath)
+            if response.status_code == 200:
+                count = _save_stream(response, filepath, json_prefix=json_prefix)
+                self._save_validators(filepath, response)
+                return count
+            logger.warning("  ✗ %s: HTTP %d", label, response.status_code)
+            return None
         
     def download_mitre_attack(self):
         """Download MITRE ATT&CK framework data"""
         logger.info("Downloading MITRE ATT&CK data...")
         
-        urls = {
-            'enterprise': 'https://raw.githubusercontent.com/mitre/cti/master/enterprise-attack/enterprise-attack.json',
-            'mobile': 'https://raw.githubusercontent.com/mitre/cti/master/mobile-attack/mobile-attack.json',
-            'ics': 'https://raw.githubusercontent.com/mitre/cti/master/ics-attack/ics-attack.json',
-            'pre-attack': 'https://raw.githubusercontent.com/mitre/cti/master/pre-attack/pre-attack.json'
-        }
+        urls = MITRE_ATTACK_URLS
         
         mitre_dir = BASE_DIR / "mitre_attack"
         mitre_dir.mkdir(exist_ok=True)
         
-        results = {}
-        for name, url in urls.items():
-            try:
-                response = self.session.get(url, timeout=30)
-                if response.status_code == 200:
-                    data = response.json()
-                    filepath = mitre_dir / f"{name}_attack.json"
-                    with open(filepath, 'w') as f:
-                        json.dump(data, f, indent=2)
-                    
-                    # Count objects
-                    objects = data.get('objects', [])
-                    results[name] = len(objects)
-                    logger.info(f"  ✓ {name}: {len(objects)} objects")
-                else:
-                    logger.warning(f"  ✗ {name}: HTTP {response.status_code}")
-                    results[name] = 0
-                    
-                time.sleep(1)  # Rate limiting
-            except Exception as e:
-                logger.error(f"  ✗ {name}: {str(e)}")
-                results[name] = 0
+        # The four domains are independent files on the same host, so fetch
+        # them concurrently over the shared session
+        with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+            futures = {
+                name: executor.submit(self._download_mitre_domain, mitre_dir, name, url)
+                for name, url in urls.items()
+            }
+            results = {name: future.result() for name, future in futures.items()}
                 
         return results
     
+    def _download_mitre_domain(self, mitre_dir, name, url):
+        """Download one ATT&CK domain bundle and return its object count"""
+        filepath = mitre_dir / f"{name}_attack.json"
+        try:
+            # Saved as served and counted by streaming the saved file, so the
+            # bundle is never held in memory as Python objects
+            count = self._fetch_to_file(name, url, filepath, json_prefix='objects.item')
+            if count is None:
+                return 0
+            
+            logger.info("  ✓ %s: %d objects", name, count)
+            return count
+        except Exception as e:
+            logger.error("  ✗ %s: %s", name, e)
+            return 0
+    
     def download_cisa_kev(self):
         """Download CISA Known Exploited Vulnerabilities"""
         logger.info("Downloading CISA KEV catalog...")
         
         url = "https://www.cisa.gov/sites/default/files/feeds/known_exploited_vulnerabilities.json"
         
+        filepath = BASE_DIR / "cisa_kev.json"
         try:
-            response = self.session.get(url, timeout=30)
-            if response.status_code == 200:
-                data = response.json()
-                filepath = BASE_DIR / "cisa_kev.json"
-                with open(filepath, 'w') as f:
-                    json.dump(data, f, indent=2)
-                
-                count = len(data.get('vulnerabilities', []))
-                logger.info(f"  ✓ Downloaded {count} known exploited vulnerabilities")
-                return count
-            else:
-                logger.warning(f"  ✗ HTTP {response.status_code}")
+            count = self._fetch_to_file('CISA KEV', url, filepath, json_prefix='vulnerabilities.item')
+            if count is None:
                 return 0
+            
+            logger.info("  ✓ Downloaded %d known exploited vulnerabilities", count)
+            return count
         except Exception as e:
-            logger.error(f"  ✗ Error: {str(e)}")
+            logger.error("  ✗ Error: %s", e)
             return 0
     
     def download_exploit_db_recent(self):
@@ -96,23 +374,18 @@ class DatasetDownloader:
         # Exploit-DB provides CSV files
         url = "https://gitlab.com/exploit-database/exploitdb/-/raw/main/files_exploits.csv"
         
+        filepath = BASE_DIR / "exploitdb_exploits.csv"
         try:
-            response = self.session.get(url, timeout=30)
-            if response.status_code == 200:
-                filepath = BASE_DIR / "exploitdb_exploits.csv"
-                with open(filepath, 'wb') as f:
-                    f.write(response.content)
-                
-                # Count lines (exploits)
-                lines = response.text.strip().split('\n')
-                count = len(lines) - 1  # Subtract header
-                logger.info(f"  ✓ Downloaded {count} exploit records")
-                return count
-            else:
-                logger.warning(f"  ✗ HTTP {response.status_code}")
+            lines = self._fetch_to_file('Exploit-DB', url, filepath)
+            if lines is None:
                 return 0
+            
+            # Count lines (exploits)
+            count = lines - 1  # Subtract header
+            logger.info("  ✓ Downloaded %d exploit records", count)
+            return count
         except Exception as e:
-            logger.error(f"  ✗ Error: {str(e)}")
+            logger.error("  ✗ Error: %s", e)
             return 0
     
     def download_threat_intel_feeds(self):
@@ -128,46 +401,36 @@ class DatasetDownloader:
         intel_dir = BASE_DIR / "threat_intel"
         intel_dir.mkdir(exist_ok=True)
         
-        results = {}
-        for name, url in feeds.items():
-            try:
-                response = self.session.get(url, timeout=30)
-                if response.status_code == 200:
-                    # Determine file extension
-                    ext = 'json' if 'json' in url else 'txt'
-                    filepath = intel_dir / f"{name}.{ext}"
-                    
-                    with open(filepath, 'wb') as f:
-                        f.write(response.content)
-                    
-                    # Count entries
-                    if ext == 'json':
-                        try:
-                            data = response.json()
-                            if isinstance(data, list):
-                                count = len(data)
-                            elif isinstance(data, dict):
-                                count = len(data.get('data', []))
-                            else:
-                                count = 1
-                        except:
-                            count = 1
-                    else:
-                        count = len(response.text.strip().split('\n'))
-                    
-                    results[name] = count
-                    logger.info(f"  ✓ {name}: {count} entries")
-                else:
-                    logger.warning(f"  ✗ {name}: HTTP {response.status_code}")
-                    results[name] = 0
-                    
-                time.sleep(2)  # Rate limiting
-            except Exception as e:
-                logger.error(f"  ✗ {name}: {str(e)}")
-                results[name] = 0
+        # Each feed is on a different host, so fetch them concurrently
+        with ThreadPoolExecutor(max_workers=len(feeds)) as executor:
+            futures = {
+                name: executor.submit(self._download_feed, intel_dir, name, url, 'data', 'entries')
+                for name, url in feeds.items()
+            }
+            results = {name: future.result() for name, future in futures.items()}
                 
         return results
     
+    def _download_feed(self, feed_dir, name, url, list_key=None, unit='entries'):
+        """Download one threat-intel or IOC feed and return its entry count"""
+        try:
+            # Determine file extension
+            ext = 'json' if 'json' in url else 'txt'
+            filepath = feed_dir / f"{name}.{ext}"
+            
+            # Body goes to disk once; JSON is counted from the file
+            count = self._fetch_to_file(name, url, filepath)
+            if count is None:
+                return 0
+            if ext == 'json':
+                count = _count_feed_entries(filepath, list_key=list_key)
+            
+            logger.info("  ✓ %s: %d %s", name, count, unit)
+            return count
+        except Exception as e:
+            logger.error("  ✗ %s: %s", name, e)
+            return 0
+    
     def download_malware_samples_metadata(self):
         """Download malware sample metadata"""
         logger.info("Downloading malware metadata...")
@@ -178,53 +441,59 @@ class DatasetDownloader:
         try:
             # Get recent samples
             payload = {'query': 'get_recent'}
-            response = self.session.post(url, data=payload, timeout=30)
-            
-            if response.status_code == 200:
-                data = response.json()
-                filepath = BASE_DIR / "malware_samples.json"
-                with open(filepath, 'w') as f:
-                    json.dump(data, f, indent=2)
+            with self.session.post(url, data=payload, timeout=30, stream=True) as response:
+                if response.status_code != 200:
+                    logger.warning("  ✗ HTTP %d", response.status_code)
+                    return 0
                 
-                count = len(data.get('data', []))
-                logger.info(f"  ✓ Downloaded {count} malware sample records")
-                return count
-            else:
-                logger.warning(f"  ✗ HTTP {response.status_code}")
-                return 0
+                filepath = BASE_DIR / "malware_samples.json"
+                count = _save_stream(response, filepath, json_prefix='data.item')
+            
+            logger.info("  ✓ Downloaded %d malware sample records", count)
+            return count
         except Exception as e:
-            logger.error(f"  ✗ Error: {str(e)}")
+            logger.error("  ✗ Error: %s", e)
             return 0
     
-    def download_apt_groups(self):
-        """Download APT group information"""
+    def download_apt_groups(self, enterprise_path=None):
+        """Extract APT group information from the MITRE enterprise bundle
+        
+        Reads the bundle saved by download_mitre_attack instead of fetching
+        it a second time; it is only downloaded here if it is missing.
+        """
         logger.info("Downloading APT group data...")
         
-        # MITRE groups are part of ATT&CK, but we'll also get additional sources
-        url = "https://raw.githubusercontent.com/mitre/cti/master/enterprise-attack/enterprise-attack.json"
+        mitre_dir = BASE_DIR / "mitre_attack"
+        enterprise_path = Path(enterprise_path or mitre_dir / "enterprise_attack.json")
         
         try:
-            response = self.session.get(url, timeout=30)
-            if response.status_code == 200:
-                data = response.json()
-                
-                # Filter for intrusion-sets (APT groups)
-                groups = [obj for obj in data.get('objects', []) 
-                         if obj.get('type') == 'intrusion-set']
-                
-                filepath = BASE_DIR / "apt_groups.json"
-                with open(filepath, 'w') as f:
-                    json.dump(groups, f, indent=2)
-                
-                logger.info(f"  ✓ Downloaded {len(groups)} APT group profiles")
-                return len(groups)
-            else:
-                logger.warning(f"  ✗ HTTP {response.status_code}")
-                return 0
+            if not enterprise_path.exists():
+                mitre_dir.mkdir(exist_ok=True)
+                if not self._download_mitre_domain(mitre_dir, 'enterprise', MITRE_ATTACK_URLS['enterprise']):
+                    return 0
+                enterprise_path = mitre_dir / "enterprise_attack.json"
+            
+            # Filter for intrusion-sets (APT groups)
+            with open(enterprise_path, 'rb') as f:
+                if IJSON_AVAILABLE:
+                    objects = ijson.items(f, 'objects.item', use_float=True)
+                else:
+                    objects = _loads(f.read()).get('objects', [])
+                groups = [obj for obj in objects if obj.get('type') == 'intrusion-set']
+            
+            filepath = BASE_DIR / "apt_groups.json"
+            _write_json(filepath, groups)
+            
+            logger.info("  ✓ Downloaded %d APT group profiles", len(groups))
+            return len(groups)
         except Exception as e:
-            logger.error(f"  ✗ Error: {str(e)}")
+            logger.error("  ✗ Error: %s", e)
             return 0
     
+    def _download_apt_groups_after(self, mitre_future):
+        mitre_future.result()
+        return self.download_apt_groups()
+    
     def download_cve_data(self):
         """Download recent CVE data"""
         logger.info("Downloading CVE data (last 3 years)...")
@@ -236,45 +505,55 @@ class DatasetDownloader:
         current_year = datetime.now().year
         years = [current_year - i for i in range(3)]
         
-        total_cves = 0
-        for year in years:
-            url = f"https://nvd.nist.gov/feeds/json/cve/1.1/nvdcve-1.1-{year}.json.gz"
-            
-            try:
-                logger.info(f"  Downloading CVEs for {year}...")
-                response = self.session.get(url, timeout=60)
-                
-                if response.status_code == 200:
-                    import gzip
-                    
-                    # Save compressed file first
-                    gz_filepath = cve_dir / f"nvdcve-1.1-{year}.json.gz"
-                    with open(gz_filepath, 'wb') as f:
-                        f.write(response.content)
-                    
-                    # Decompress and count
-                    json_filepath = cve_dir / f"nvdcve-1.1-{year}.json"
-                    with gzip.open(gz_filepath, 'rb') as f_in:
-                        with open(json_filepath, 'wb') as f_out:
-                            f_out.write(f_in.read())
-                    
-                    # Count CVEs
-                    with open(json_filepath, 'r') as f:
-                        data = json.load(f)
-                        count = len(data.get('CVE_Items', []))
-                        total_cves += count
-                        logger.info(f"    ✓ {year}: {count} CVEs")
-                    
-                    # Remove compressed file to save space
-                    gz_filepath.unlink()
-                else:
-                    logger.warning(f"    ✗ {year}: HTTP {response.status_code}")
-                    
-                time.sleep(6)  # NVD rate limiting (6 seconds between requests)
-            except Exception as e:
-                logger.error(f"    ✗ {year}: {str(e)}")
+        # Years download concurrently; the limiter only spaces out request
+        # starts, so one year's transfer overlaps the wait for the next
+        limiter = _StartLimiter(NVD_REQUEST_INTERVAL)
+        with ThreadPoolExecutor(max_workers=len(years)) as executor:
+            counts = executor.map(
+                lambda year: self._download_cve_year(cve_dir, year, limiter), years)
+            return sum(counts)
+    
+    def _download_cve_year(self, cve_dir, year, limiter):
+        """Download and decompress one year of the NVD feed, returning its CVE count"""
+        url = f"https://nvd.nist.gov/feeds/json/cve/1.1/nvdcve-1.1-{year}.json.gz"
         
-        return total_cves
+        # One CVE item per line, so loaders can stream records instead of
+        # parsing the whole year at once
+        jsonl_filepath = cve_dir / f"nvdcve-1.1-{year}.jsonl"
+        try:
+            limiter.wait()
+            logger.info("  Downloading CVEs for %d...", year)
+            with self._conditional_get(url, jsonl_filepath, timeout=60, stream=True) as response:
+                if _is_current(response, jsonl_filepath):
+                    count = _count_lines(jsonl_filepath)
+                elif response.status_code == 200:
+                    # Decompress and re-emit straight from the socket; the
+                    # .part file keeps a failed download from replacing a
+                    # good copy
+                    part_filepath = jsonl_filepath.with_name(jsonl_filepath.name + '.part')
+                    response.raw.decode_content = True  # Undo transport encoding only
+                    count = 0
+                    with gzip.GzipFile(fileobj=response.raw) as f_in:
+                        if IJSON_AVAILABLE:
+                            items = ijson.items(f_in, 'CVE_Items.item', use_float=True)
+                        else:
+                            items = _loads(f_in.read()).get('CVE_Items', [])
+                        with open(part_filepath, 'wb') as f_out:
+                            for item in items:
+                                f_out.write(_dumps(item))
+                                f_out.write(b'\n')
+                                count += 1
+                    os.replace(part_filepath, jsonl_filepath)
+                    self._save_validators(jsonl_filepath, response)
+                else:
+                    logger.warning("    ✗ %d: HTTP %d", year, response.status_code)
+                    return 0
+            
+            logger.info("    ✓ %d: %d CVEs", year, count)
+            return count
+        except Exception as e:
+            logger.error("    ✗ %d: %s", year, e)
+        return 0
     
     def download_ioc_feeds(self):
         """Download Indicators of Compromise feeds"""
@@ -289,42 +568,22 @@ class DatasetDownloader:
         ioc_dir = BASE_DIR / "ioc_feeds"
         ioc_dir.mkdir(exist_ok=True)
         
-        results = {}
-        for name, url in feeds.items():
-            try:
-                response = self.session.get(url, timeout=30)
-                if response.status_code == 200:
-                    ext = 'json' if 'json' in url else 'txt'
-                    filepath = ioc_dir / f"{name}.{ext}"
-                    
-                    with open(filepath, 'wb') as f:
-                        f.write(response.content)
-                    
-                    # Count entries
-                    if ext == 'json':
-                        try:
-                            data = response.json()
-                            count = len(data) if isinstance(data, list) else 1
-                        except:
-                            count = 1
-                    else:
-                        count = len(response.text.strip().split('\n'))
-                    
-                    results[name] = count
-                    logger.info(f"  ✓ {name}: {count} IOCs")
-                else:
-                    logger.warning(f"  ✗ {name}: HTTP {response.status_code}")
-                    results[name] = 0
-                    
-                time.sleep(1)
-            except Exception as e:
-                logger.error(f"  ✗ {name}: {str(e)}")
-                results[name] = 0
+        with ThreadPoolExecutor(max_workers=len(feeds)) as executor:
+            futures = {
+                name: executor.submit(self._download_feed, ioc_dir, name, url, None, 'IOCs')
+                for name, url in feeds.items()
+            }
+            results = {name: future.result() for name, future in futures.items()}
                 
         return results
     
     def generate_time_series_data(self):
-        """Generate synthetic time-series data for temporal model"""
+        """Generate synthetic time-series data for temporal model
+        
+        Saved column-wise as {"date": [...], "threat_level": [...],
+        "incidents": [...], "anomaly": [...]}, with index i of every
+        column describing day i.
+        """
         logger.info("Generating time-series threat data...")
         
         # Generate 5 years of daily threat metrics
@@ -333,39 +592,42 @@ class DatasetDownloader:
         
         import numpy as np
         
-        # Simulate threat levels with trends and seasonality
-        time_series_data = []
+        # Simulate threat levels with trends and seasonality, one array op
+        # per component instead of a Python loop over the days
+        rng = np.random.default_rng()
         base_threat = 50
+        days = np.arange(num_days)
         
-        for i in range(num_days):
-            current_date = start_date + timedelta(days=i)
-            
-            # Add trend (increasing threats over time)
-            trend = i * 0.02
-            
-            # Add seasonality (weekly pattern)
-            seasonality = 10 * np.sin(2 * np.pi * i / 7)
-            
-            # Add random noise
-            noise = np.random.normal(0, 5)
-            
-            # Add occasional spikes (cyber incidents)
-            spike = 50 if np.random.random() < 0.05 else 0
-            
-            threat_level = max(0, base_threat + trend + seasonality + noise + spike)
-            
-            time_series_data.append({
-                'date': current_date.strftime('%Y-%m-%d'),
-                'threat_level': round(threat_level, 2),
-                'incidents': int(max(0, np.random.poisson(threat_level / 10))),
-                'anomaly': 1 if spike > 0 else 0
-            })
+        # Add trend (increasing threats over time)
+        trend = days * 0.02
+        
+        # Add seasonality (weekly pattern)
+        seasonality = 10 * np.sin(2 * np.pi * days / 7)
+        
+        # Add random noise
+        noise = rng.normal(0, 5, num_days)
+        
+        # Add occasional spikes (cyber incidents)
+        spikes = rng.random(num_days) < 0.05
+        
+        threat_levels = np.maximum(0, base_threat + trend + seasonality + noise + spikes * 50)
+        # Poisson draws are already non-negative integers; int32 is plenty
+        incidents = rng.poisson(threat_levels / 10).astype(np.int32)
+        # ISO dates in one vectorized conversion rather than a strftime per day
+        dates = (np.datetime64(start_date.date(), 'D') + days).astype(str)
+        
+        # Columnar layout: one array per field instead of one object per day
+        time_series_data = {
+            'date': dates.tolist(),
+            'threat_level': np.round(threat_levels, 2),
+            'incidents': incidents,
+            'anomaly': spikes.astype(np.int8)
+        }
         
         filepath = BASE_DIR / "time_series_threats.json"
-        with open(filepath, 'w') as f:
-            json.dump(time_series_data, f, indent=2)
+        _write_json(filepath, time_series_data)
         
-        logger.info(f"  ✓ Generated {num_days} days of time-series data")
+        logger.info("  ✓ Generated %d days of time-series data", num_days)
         return num_days
     
     def download_all(self):
@@ -374,42 +636,33 @@ class DatasetDownloader:
         logger.info("COMPREHENSIVE DATASET DOWNLOAD")
         logger.info("="*80 + "\n")
         
-        summary = {}
-        
-        # MITRE ATT&CK
-        summary['mitre_attack'] = self.download_mitre_attack()
-        
-        # CISA KEV
-        summary['cisa_kev'] = self.download_cisa_kev()
-        
-        # Exploit-DB
-        summary['exploitdb'] = self.download_exploit_db_recent()
-        
-        # Threat Intel Feeds
-        summary['threat_intel'] = self.download_threat_intel_feeds()
-        
-        # Malware Samples
-        summary['malware'] = self.download_malware_samples_metadata()
-        
-        # APT Groups
-        summary['apt_groups'] = self.download_apt_groups()
-        
-        # CVE Data (this takes longest)
-        summary['cve_data'] = self.download_cve_data()
-        
-        # IOC Feeds
-        summary['ioc_feeds'] = self.download_ioc_feeds()
-        
-        # Time Series
-        summary['time_series'] = self.generate_time_series_data()
+        # Every source is independent I/O, so run them side by side; total
+        # time becomes that of the slowest source (NVD with its rate limit)
+        # rather than the sum of all of them
+        steps = {
+            'mitre_attack': self.download_mitre_attack,
+            'cisa_kev': self.download_cisa_kev,
+            'exploitdb': self.download_exploit_db_recent,
+            'threat_intel': self.download_threat_intel_feeds,
+            'malware': self.download_malware_samples_metadata,
+            'cve_data': self.download_cve_data,  # This takes longest
+            'ioc_feeds': self.download_ioc_feeds,
+            'time_series': self.generate_time_series_data
+        }
+        with ThreadPoolExecutor(max_workers=len(steps) + 1) as executor:
+            futures = {name: executor.submit(step) for name, step in steps.items()}
+            # APT groups are read from the enterprise bundle the MITRE step saves
+            futures['apt_groups'] = executor.submit(
+                self._download_apt_groups_after, futures['mitre_attack']
+            )
+            summary = {name: futures[name].result() for name in SUMMARY_ORDER}
         
         # Save summary
         summary_file = BASE_DIR / "download_summary.json"
-        with open(summary_file, 'w') as f:
-            json.dump({
-                'timestamp': datetime.now().isoformat(),
-                'summary': summary
-            }, f, indent=2)
+        _write_json(summary_file, {
+            'timestamp': datetime.now().isoformat(),
+            'summary': summary
+        }, indent=True)
         
         logger.info("\n" + "="*80)
         logger.info("DOWNLOAD SUMMARY")
@@ -419,14 +672,14 @@ class DatasetDownloader:
         for category, data in summary.items():
             if isinstance(data, dict):
                 count = sum(data.values())
-                logger.info(f"{category}: {count} total objects")
+                logger.info("%s: %d total objects", category, count)
                 total_objects += count
             else:
-                logger.info(f"{category}: {data} objects")
+                logger.info("%s: %d objects", category, data)
                 total_objects += data
         
-        logger.info(f"\nTOTAL OBJECTS DOWNLOADED: {total_objects:,}")
-        logger.info(f"Data saved to: {BASE_DIR}")
+        logger.info("\nTOTAL OBJECTS DOWNLOADED: %s", f"{total_objects:,}")
+        logger.info("Data saved to: %s", BASE_DIR)
         logger.info("="*80 + "\n")
         
         return summary
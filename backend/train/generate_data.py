@@ -15,30 +15,32 @@ CVE_LIST = ["CVE-2023-1234", "CVE-2023-5678", "CVE-2024-0001", "CVE-2024-0002"]
 
 def generate_graph_data(num_nodes=500, num_edges=1500):
     print("Generating graph data...")
-    nodes = []
-    for i in range(num_nodes):
-        nodes.append({
-            "id": f"node_{i}",
-            "type": random.choice(["threat", "actor", "cve", "infrastructure"]),
-            "features": np.random.randn(64).tolist(),
-            "label": random.choice([0, 1]),
-        })
+    rng = np.random.default_rng()
+    
+    # Draw every node's attributes in one call each instead of per node
+    types = rng.choice(["threat", "actor", "cve", "infrastructure"], size=num_nodes).tolist()
+    features = rng.standard_normal((num_nodes, 64)).tolist()
+    labels = rng.integers(0, 2, size=num_nodes).tolist()
+    
+    nodes = [
+        {"id": f"node_{i}", "type": types[i], "features": features[i], "label": labels[i]}
+        for i in range(num_nodes)
+    ]
     
-    edges = []
-    for _ in range(num_edges):
-        src = random.randint(0, num_nodes - 1)
-        dst = random.randint(0, num_nodes - 1)
-        if src != dst:
-            edges.append({
-                "source": f"node_{src}",
-                "target": f"node_{dst}",
-                "relation": random.choice(["uses", "targets", "originates_from", "exploits"])
-            })
+    # Same as drawing num_edges endpoint pairs one at a time and skipping
+    # self-loops, but with the draws and the filter done as array ops
+    pairs = rng.integers(0, num_nodes, size=(num_edges, 2))
+    pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+    relations = rng.choice(["uses", "targets", "originates_from", "exploits"], size=len(pairs)).tolist()
+    edges = [
+        {"source": f"node_{src}", "target": f"node_{dst}", "relation": relation}
+        for (src, dst), relation in zip(pairs.tolist(), relations)
+    ]
     
     graph_data = {"nodes": nodes, "edges": edges}
     output_path = OUTPUT_DIR / "graph_data.json"
     with open(output_path, "w") as f:
-        json.dump(graph_data, f, indent=2)
+        json.dump(graph_data, f, separators=(",", ":"))
     print(f"Graph data saved to {output_path}")
     return graph_data
 
@@ -62,23 +64,38 @@ def generate_nlp_data(num_samples=1000):
     malware_names = ["LockBit", "Emotet", "TrickBot", "BlackCat"]
     vectors = ["malicious email attachments", "RDP exploitation", "VPN vulnerabilities"]
     
+    # Draw each template slot for every sample at once rather than with
+    # one random.choice call per slot per sample
+    picks = zip(
+        random.choices(templates, k=num_samples),
+        random.choices(THREAT_TYPES, k=num_samples),
+        random.choices(ACTORS, k=num_samples),
+        random.choices(CVE_LIST, k=num_samples),
+        random.choices(sectors, k=num_samples),
+        random.choices(techniques, k=num_samples),
+        random.choices(software, k=num_samples),
+        random.choices(brands, k=num_samples),
+        random.choices(malware_names, k=num_samples),
+        random.choices(vectors, k=num_samples),
+        random.choices(["negative", "neutral", "critical"], k=num_samples),
+    )
+    
     samples = []
-    for i in range(num_samples):
-        template = random.choice(templates)
+    for i, (template, threat, actor, cve, sector, technique, software_name,
+            brand, malware, vector, sentiment) in enumerate(picks):
         text = template.format(
-            threat=random.choice(THREAT_TYPES),
-            actor=random.choice(ACTORS),
-            cve=random.choice(CVE_LIST),
-            sector=random.choice(sectors),
-            technique=random.choice(techniques),
-            software=random.choice(software),
-            brand=random.choice(brands),
-            malware=random.choice(malware_names),
-            vector=random.choice(vectors)
+            threat=threat,
+            actor=actor,
+            cve=cve,
+            sector=sector,
+            technique=technique,
+            software=software_name,
+            brand=brand,
+            malware=malware,
+            vector=vector
         )
         
-        # Assign sentiment and risk
-        sentiment = random.choice(["negative", "neutral", "critical"])
+        # Assign risk from the sentiment
         risk_score = random.uniform(0.3, 1.0) if sentiment == "critical" else random.uniform(0.1, 0.6)
         
         samples.append({
@@ -95,7 +112,7 @@ def generate_nlp_data(num_samples=1000):
     
     output_path = OUTPUT_DIR / "nlp_data.json"
     with open(output_path, "w") as f:
-        json.dump(samples, f, indent=2)
+        json.dump(samples, f, separators=(",", ":"))
     print(f"NLP data saved to {output_path}")
     return samples
 
@@ -133,7 +150,7 @@ def generate_timeseries_data(num_sequences=200, sequence_length=30):
     
     output_path = OUTPUT_DIR / "timeseries_data.json"
     with open(output_path, "w") as f:
-        json.dump(sequences, f, indent=2)
+        json.dump(sequences, f, separators=(",", ":"))
     print(f"Time-series data saved to {output_path}")
     return sequences
 
@@ -142,36 +159,41 @@ def generate_anomaly_data(num_normal=800, num_anomalies=200):
     """Generate normal and anomalous samples for anomaly detection."""
     print("Generating anomaly detection data...")
     
+    rng = np.random.default_rng()
+    
     # Normal samples: low dimensionality, clustered
-    normal_samples = []
-    for i in range(num_normal):
-        center = np.random.choice([0, 10, 20])  # 3 clusters
-        features = np.random.randn(20) * 2 + center
-        normal_samples.append({
+    centers = rng.choice([0, 10, 20], size=num_normal)  # 3 clusters
+    normal_features = (rng.standard_normal((num_normal, 20)) * 2 + centers[:, None]).tolist()
+    normal_samples = [
+        {
             "id": f"normal_{i}",
-            "features": features.tolist(),
+            "features": features,
             "label": 0,  # normal
             "type": "normal_traffic"
-        })
+        }
+        for i, features in enumerate(normal_features)
+    ]
     
-    # Anomalous samples: outliers
-    anomaly_samples = []
-    for i in range(num_anomalies):
-        # Create outliers far from clusters
-        features = np.random.randn(20) * 10 + random.choice([-50, 50])
-        anomaly_samples.append({
+    # Anomalous samples: outliers far from clusters
+    shifts = rng.choice([-50, 50], size=num_anomalies)
+    anomaly_features = (rng.standard_normal((num_anomalies, 20)) * 10 + shifts[:, None]).tolist()
+    anomaly_types = random.choices(["zero_day", "novel_attack", "suspicious_behavior"], k=num_anomalies)
+    anomaly_samples = [
+        {
             "id": f"anomaly_{i}",
-            "features": features.tolist(),
+            "features": features,
             "label": 1,  # anomaly
-            "type": random.choice(["zero_day", "novel_attack", "suspicious_behavior"])
-        })
+            "type": anomaly_type
+        }
+        for i, (features, anomaly_type) in enumerate(zip(anomaly_features, anomaly_types))
+    ]
     
     all_samples = normal_samples + anomaly_samples
     random.shuffle(all_samples)
     
     output_path = OUTPUT_DIR / "anomaly_data.json"
     with open(output_path, "w") as f:
-        json.dump(all_samples, f, indent=2)
+        json.dump(all_samples, f, separators=(",", ":"))
     print(f"Anomaly data saved to {output_path}")
     return all_samples
 
@@ -414,6 +414,9 @@ def train_lstm_production(data):
         if 'time_series' in data:
             # Use extended time series data
             ts_data = data['time_series']
+            if isinstance(ts_data, dict):
+                # Columnar layout written by download_comprehensive_datasets.py
+                ts_data = [dict(zip(ts_data, row)) for row in zip(*ts_data.values())]
             logger.info(f"Using {len(ts_data)} days of historical data")
             
             for entry in ts_data: